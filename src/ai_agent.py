@@ -824,7 +824,7 @@ class EnhancedMattressAIAgent:
                 budget_max = budget_info.get('max', 1000)
                 budget_filter = (budget_min, budget_max)
             
-            # Enhanced RAG 검색 실행
+            # Enhanced RAG 검색 실행 (반복/유사 쿼리는 RAG 시스템의 검색 캐시가 처리)
             search_results = self.rag_system.search_mattresses(
                 user_query, 
                 n_results=n_results,
@@ -11,19 +11,128 @@
 
 import json
 import logging
+import mmap
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import re
 import hashlib
+import functools
+from collections import Counter
+import numpy as np
+
+# 스트리밍 JSON 파서 (선택사항)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# 고속 JSON 파서 (선택사항)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 정규식 사전 컴파일
+_RE_PRICE_STRIP = re.compile(r'[^\d.]')
+
+# 한 줄에 매트리스 하나씩 저장하는 NDJSON 파일 확장자
+_NDJSON_SUFFIXES = ('.jsonl', '.ndjson')
+
+# 매트리스 리스트를 담는 최상위 키 (우선순위 순)
+_MATTRESS_LIST_KEYS = ('mattresses', 'data')
+
+# 누락 시 기본값을 채우는 필수 필드 (필드명, 기본값)
+_REQUIRED_FIELD_DEFAULTS: Tuple[Tuple[str, str], ...] = (
+    ('name', 'Unknown Mattress'),
+    ('brand', 'Unknown Brand'),
+    ('type', 'Unknown Type'),
+)
+
+# 값 종류가 적어 레코드 간에 반복되는 범주형 문자열 필드 (sys.intern 대상)
+_INTERNED_FIELDS = ('brand', 'type', 'firmness', 'thickness')
+
+# 튜플로 정규화하는 리스트 필드 (필드명, 결합 텍스트 캐시 키)
+_LIST_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ('features', '_features_text'),
+    ('target_users', '_target_users_text'),
+)
+
+# 이 크기 이상의 JSON 파일은 orjson이 있어도 ijson으로 스트리밍 로드
+# (그보다 작으면 orjson 전체 파싱이 ijson 이벤트 단위 파싱보다 훨씬 빠름)
+_STREAMING_MIN_FILE_SIZE = 64 << 20
+
+# 데이터 파일 읽기 버퍼 크기 (기본 8KB 대신 1MB 단위로 읽어 read 시스템 콜 횟수 감소)
+_READ_BUFFER_SIZE = 1 << 20
+
+
+def _short_hash(data: bytes) -> str:
+    """ID 접미사용 8자리 16진수 해시 (설치 환경과 무관하게 같은 ID가 나오도록 blake2b 고정)"""
+    return hashlib.blake2b(data, digest_size=4).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize_id_cached(raw_id: str) -> str:
+    """
+    ChromaDB 호환 ID 정규화 (메모이제이션 적용)
+    
+    동일 브랜드/이름 조합이 반복 조회되므로 결과를 캐시합니다.
+    
+    Args:
+        raw_id: 원본 ID 문자열
+        
+    Returns:
+        str: 정규화된 ID
+    """
+    # 1~4. 단일 패스 정리
+    # - 한글/영문/숫자/언더스코어(\w)는 유지, 그 외 특수문자는 언더스코어로 변환
+    # - 연속된 언더스코어는 하나로 축약, 시작/끝 언더스코어 제거
+    chars = []
+    prev_underscore = True  # 시작 언더스코어 제거용
+    for ch in raw_id.strip():
+        if ch != '_' and ch.isalnum():
+            chars.append(ch)
+            prev_underscore = False
+        elif not prev_underscore:
+            chars.append('_')
+            prev_underscore = True
+    
+    if chars and chars[-1] == '_':
+        chars.pop()
+    
+    sanitized = ''.join(chars)
+    
+    # 5. 길이 제한 (ChromaDB는 보통 ID 길이 제한이 있음)
+    if len(sanitized) > 100:
+        # 해시를 사용해서 고유성 보장
+        hash_suffix = _short_hash(sanitized.encode())
+        sanitized = sanitized[:80] + "_" + hash_suffix
+    
+    # 6. 빈 문자열 처리
+    if not sanitized:
+        sanitized = "mattress_unknown"
+    
+    # 7. 숫자로만 시작하는 경우 방지
+    if sanitized[0].isdigit():
+        sanitized = "mattress_" + sanitized
+    
+    return sanitized
+
 
 class MattressDataLoader:
     """매트리스 데이터 로더 클래스 (ChromaDB 호환성 강화)"""
     
+    # 검색 텍스트 선택 항목 접두어
+    _FEATURES_PREFIX = ' 특징: '
+    _TARGET_USERS_PREFIX = ' 추천 대상: '
+    _DESCRIPTION_PREFIX = ' 설명: '
+    
     def __init__(self, data_path: Optional[str] = None):
         """
         데이터 로더 초기화
@@ -42,6 +151,10 @@ class MattressDataLoader:
         
         # 데이터 저장용
         self.mattresses = []
+        self._id_to_mattress: Dict[str, Dict] = {}  # RAG ID → 매트리스 인덱스
+        self._source_id_to_mattress: Dict[str, Dict] = {}  # 원본 'id' 필드 → 매트리스 인덱스
+        self._statistics_cache: Optional[Dict] = None  # get_statistics 결과 (재로드 시 무효화)
+        self._columns: Optional[Dict[str, Union[np.ndarray, List[str]]]] = None  # 집계용 열 단위 데이터
         
         logger.info(f"데이터 로더 초기화 완료. 경로: {self.data_file}")
     
@@ -58,42 +171,17 @@ class MattressDataLoader:
         if not raw_id:
             return "unknown_mattress"
         
-        # 1. 기본 정리
-        sanitized = str(raw_id).strip()
-        
-        # 2. 한글 및 특수문자를 안전한 문자로 변환
-        # 한글은 유니코드로, 특수문자는 언더스코어로
-        sanitized = re.sub(r'[^\w가-힣]', '_', sanitized)
-        
-        # 3. 연속된 언더스코어 제거
-        sanitized = re.sub(r'_+', '_', sanitized)
-        
-        # 4. 시작/끝 언더스코어 제거
-        sanitized = sanitized.strip('_')
-        
-        # 5. 길이 제한 (ChromaDB는 보통 ID 길이 제한이 있음)
-        if len(sanitized) > 100:
-            # 해시를 사용해서 고유성 보장
-            hash_suffix = hashlib.md5(sanitized.encode()).hexdigest()[:8]
-            sanitized = sanitized[:80] + "_" + hash_suffix
-        
-        # 6. 빈 문자열 처리
-        if not sanitized:
-            sanitized = "mattress_unknown"
-        
-        # 7. 숫자로만 시작하는 경우 방지
-        if sanitized[0].isdigit():
-            sanitized = "mattress_" + sanitized
-        
-        return sanitized
+        return _sanitize_id_cached(str(raw_id))
     
-    def _generate_unique_id(self, mattress: Dict, existing_ids: set) -> str:
+    def _generate_unique_id(self, mattress: Dict, existing_ids: set,
+                            collision_counter: Optional[Dict[str, int]] = None) -> str:
         """
         고유한 ID 생성
         
         Args:
             mattress: 매트리스 데이터
             existing_ids: 기존 ID 집합
+            collision_counter: 기본 ID별 마지막 접미사 번호 (호출자가 유지, 선택)
             
         Returns:
             str: 고유한 ID
@@ -102,190 +190,300 @@ class MattressDataLoader:
         name = mattress.get('name', 'Unknown').strip()
         brand = mattress.get('brand', 'Unknown').strip()
         
-        # 기본 ID 패턴
+        # 기본 ID 패턴 (정규화 결과는 _sanitize_id_cached의 LRU 캐시에서 재사용)
         base_id = f"mattress_{brand}_{name}"
         sanitized_id = self._sanitize_id(base_id)
         
-        # 중복 확인 및 처리
-        final_id = sanitized_id
-        counter = 1
+        # 중복 없으면 바로 반환
+        if sanitized_id not in existing_ids:
+            return sanitized_id
         
-        while final_id in existing_ids:
-            final_id = f"{sanitized_id}_{counter}"
+        # 중복 처리: 마지막으로 부여한 접미사 다음 번호부터 확인
+        counter = collision_counter.get(sanitized_id, 0) if collision_counter is not None else 0
+        
+        for _ in range(1000):
             counter += 1
-            
-            # 무한 루프 방지
-            if counter > 1000:
-                # 해시 사용
-                unique_hash = hashlib.md5(f"{base_id}_{counter}".encode()).hexdigest()[:8]
-                final_id = f"mattress_{unique_hash}"
+            final_id = f"{sanitized_id}_{counter}"
+            if final_id not in existing_ids:
                 break
+        else:
+            # 무한 루프 방지: 해시 사용
+            unique_hash = _short_hash(f"{base_id}_{counter}".encode())
+            final_id = f"mattress_{unique_hash}"
+        
+        if collision_counter is not None:
+            collision_counter[sanitized_id] = counter
         
         return final_id
     
-    def _convert_price_to_manwon(self, price_won: Union[int, float, str]) -> float:
+    def _parse_price(self, price: Union[int, float, str, None]) -> float:
         """
-        원 단위 가격을 만원 단위로 변환
+        가격 값을 숫자로 변환 (문자열이면 숫자만 추출)
         
         Args:
-            price_won: 원 단위 가격 (예: 500000)
+            price: 원본 가격 값 (예: 500000, "500,000원")
             
         Returns:
-            float: 만원 단위 가격 (예: 50.0)
+            float: 숫자 가격, 변환 실패 시 0.0
         """
+        # 숫자 타입은 바로 반환 (대부분의 데이터)
+        price_type = type(price)
+        if price_type is int or price_type is float:
+            return float(price)
+        
         try:
-            if isinstance(price_won, str):
+            if isinstance(price, str):
                 # 문자열에서 숫자만 추출
-                price_won = re.sub(r'[^\d.]', '', price_won)
-                price_won = float(price_won) if price_won else 0
+                price = _RE_PRICE_STRIP.sub('', price)
+                return float(price) if price else 0.0
             
-            price_value = float(price_won)
+            return float(price) if price else 0.0
             
-            # 이미 만원 단위인지 확인 (1000 이하면 이미 만원 단위일 가능성)
-            if price_value <= 1000:  # 1000만원 이하면 이미 만원 단위일 수 있음
-                return price_value
-            else:
-                # 원 단위에서 만원 단위로 변환
-                return price_value / 10000
-                
         except (ValueError, TypeError):
-            logger.warning(f"가격 변환 실패: {price_won}")
+            logger.warning(f"가격 변환 실패: {price}")
             return 0.0
-
-    def _validate_metadata(self, metadata: Dict) -> Dict:
+    
+    def _normalize_one_mattress(self, mattress: Dict, price_manwon: float, price_won: int) -> Dict:
         """
-        ChromaDB 메타데이터 검증 및 정리
+        매트리스 1개에 정규화된 가격과 필수 필드 적용
+        
+        파싱 직후의 레코드는 로더가 소유하므로 복사하지 않고 그대로 수정합니다.
         
         Args:
-            metadata: 원본 메타데이터
+            mattress: 원본 매트리스 데이터
+            price_manwon: 만원 단위 가격
+            price_won: 원본 가격 (정수)
             
         Returns:
-            Dict: 검증된 메타데이터
+            Dict: 가격이 정규화된 매트리스 데이터
         """
-        validated = {}
+        normalized_mattress = mattress
         
-        for key, value in metadata.items():
-            # 키 정리
-            clean_key = str(key).strip()
-            if not clean_key:
-                continue
-            
-            # 값 검증 및 변환
-            if value is None:
-                validated[clean_key] = ""
-            elif isinstance(value, (int, float)):
-                validated[clean_key] = value
-            elif isinstance(value, bool):
-                validated[clean_key] = value
-            elif isinstance(value, (list, dict)):
-                # 복잡한 타입은 문자열로 변환
-                validated[clean_key] = str(value)
-            else:
-                # 문자열로 변환
-                validated[clean_key] = str(value).strip()
+        # 만원 단위 가격
+        normalized_mattress['price'] = price_manwon
         
-        return validated
+        # 원본 가격도 보관 (필요시 사용)
+        normalized_mattress['price_won'] = price_won
+        
+        # 표시용 가격 문자열
+        if price_manwon >= 100:
+            normalized_mattress['price_display'] = f"{int(price_manwon)}만원"
+        else:
+            normalized_mattress['price_display'] = f"{int(round(price_manwon))}만원"
+        
+        # 필수 필드 보장
+        for key, default in _REQUIRED_FIELD_DEFAULTS:
+            if not normalized_mattress.get(key):
+                normalized_mattress[key] = default
+        
+        # 반복되는 범주형 문자열은 인터닝하여 동일 객체 공유 (메모리 절감, 비교 가속)
+        for key in _INTERNED_FIELDS:
+            value = normalized_mattress.get(key)
+            if type(value) is str:
+                normalized_mattress[key] = sys.intern(value)
+        
+        # 리스트 필드 정규화 (누락/잘못된 타입은 빈 튜플) + 결합 텍스트 캐시
+        for key, text_key in _LIST_FIELDS:
+            values = normalized_mattress.get(key)
+            values = tuple(values) if isinstance(values, (list, tuple)) else ()
+            normalized_mattress[key] = values
+            normalized_mattress[text_key] = ', '.join(map(str, values))
+        
+        return normalized_mattress
     
-    def _normalize_mattress_prices(self, mattresses: List[Dict]) -> List[Dict]:
+    def _normalize_mattress_prices(self, mattresses: Iterable[Dict]) -> List[Dict]:
         """
         매트리스 데이터의 가격을 만원 단위로 정규화
         
+        문자열 정리는 행 단위로 하고, 만원 단위 변환은 NumPy로 일괄 처리합니다.
+        
         Args:
-            mattresses: 원본 매트리스 데이터 리스트
+            mattresses: 원본 매트리스 데이터 (리스트 또는 스트리밍 제너레이터)
             
         Returns:
             List[Dict]: 가격이 정규화된 매트리스 데이터
         """
-        normalized_mattresses = []
+        # 0. 레코드 형식 검증 (딕셔너리가 아닌 항목은 제외)
+        mattresses = list(mattresses)
+        # 정상 데이터는 all()로 한 번만 확인하고, 잘못된 항목이 있을 때만 필터링된 리스트 생성
+        if not all(isinstance(m, dict) for m in mattresses):
+            valid_mattresses = [m for m in mattresses if isinstance(m, dict)]
+            logger.warning(f"잘못된 매트리스 레코드 제외: {len(mattresses) - len(valid_mattresses)}개")
+            mattresses = valid_mattresses
+        if not mattresses:
+            return []
         
-        for mattress in mattresses:
-            try:
-                normalized_mattress = mattress.copy()
-                
-                # 원본 가격 (원 단위)
-                original_price = mattress.get('price', 0)
-                
-                # 만원 단위로 변환
-                price_manwon = self._convert_price_to_manwon(original_price)
-                normalized_mattress['price'] = price_manwon
-                
-                # 원본 가격도 보관 (필요시 사용)
-                normalized_mattress['price_won'] = int(float(original_price)) if original_price else 0
-                
-                # 표시용 가격 문자열
-                if price_manwon >= 100:
-                    normalized_mattress['price_display'] = f"{int(price_manwon)}만원"
-                else:
-                    normalized_mattress['price_display'] = f"{int(round(price_manwon))}만원"
-                
-                # 필수 필드 보장
-                if 'name' not in normalized_mattress or not normalized_mattress['name']:
-                    normalized_mattress['name'] = 'Unknown Mattress'
-                
-                if 'brand' not in normalized_mattress or not normalized_mattress['brand']:
-                    normalized_mattress['brand'] = 'Unknown Brand'
-                
-                if 'type' not in normalized_mattress or not normalized_mattress['type']:
-                    normalized_mattress['type'] = 'Unknown Type'
-                
-                normalized_mattresses.append(normalized_mattress)
-                
-            except Exception as e:
-                logger.error(f"매트리스 데이터 정규화 실패: {e}")
-                # 기본값으로 매트리스 추가
-                default_mattress = {
-                    'name': 'Unknown Mattress',
-                    'brand': 'Unknown Brand',
-                    'type': 'Unknown Type',
-                    'price': 0.0,
-                    'price_won': 0,
-                    'price_display': '0만원'
-                }
-                normalized_mattresses.append(default_mattress)
+        # 1. 원본 가격 파싱 (행 단위)
+        raw_prices = np.fromiter(
+            (self._parse_price(m.get('price', 0)) for m in mattresses),
+            dtype=np.float64,
+            count=len(mattresses)
+        )
+        # 비정상 값(NaN, 무한대) 정리
+        raw_prices = np.nan_to_num(raw_prices, nan=0.0, posinf=0.0, neginf=0.0)
+        
+        # 2. 만원 단위 변환 (1000 이하면 이미 만원 단위로 간주)
+        prices_manwon = np.where(raw_prices <= 1000, raw_prices, raw_prices / 10000)
+        prices_won = raw_prices.astype(np.int64)
+        
+        return [
+            self._normalize_one_mattress(mattress, price_manwon, price_won)
+            for mattress, price_manwon, price_won
+            in zip(mattresses, prices_manwon.tolist(), prices_won.tolist())
+        ]
+    
+    def _load_streaming(self) -> Optional[List[Dict]]:
+        """
+        ijson으로 'mattresses' 배열을 레코드 단위로 스트리밍 로드
+        
+        전체 JSON을 메모리에 올리지 않고 매트리스 하나씩 파싱하여 바로 정규화합니다.
         
-        return normalized_mattresses
+        Returns:
+            Optional[List[Dict]]: 정규화된 매트리스 리스트, 스트리밍 불가 구조면 None
+        """
+        try:
+            with open(self.data_file, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+                records = ijson.items(f, 'mattresses.item', use_float=True)
+                mattresses = self._normalize_mattress_prices(records)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logger.warning(f"스트리밍 로드 실패, 일반 로드로 전환: {e}")
+            return None
+        
+        # 'mattresses' 키가 없는 구조 (리스트, 'data' 키 등)
+        if not mattresses:
+            return None
+        
+        return mattresses
+
+    def _iter_ndjson(self, f) -> Iterator[Dict]:
+        """NDJSON 파일에서 매트리스를 한 줄씩 파싱 (빈 줄은 건너뜀)"""
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        for line in f:
+            line = line.strip()
+            if line:
+                yield loads(line)
+
+    def _load_ndjson(self) -> List[Dict]:
+        """
+        NDJSON(.jsonl / .ndjson) 파일을 줄 단위로 스트리밍 로드
+        
+        전체 파일을 읽지 않고 한 줄씩 파싱하여 바로 정규화합니다.
+        
+        Returns:
+            List[Dict]: 정규화된 매트리스 리스트
+        """
+        with open(self.data_file, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+            return self._normalize_mattress_prices(self._iter_ndjson(f))
 
     def load_mattress_data(self) -> bool:
         """
         매트리스 데이터 로드 (ChromaDB 호환성 강화)
         """
         try:
-            if not self.data_file.exists():
-                logger.error(f"데이터 파일을 찾을 수 없습니다: {self.data_file}")
-                return False
-            
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if self.data_file.suffix.lower() in _NDJSON_SUFFIXES:
+                # NDJSON은 줄 단위 스트리밍
+                mattresses = self._load_ndjson()
+            elif IJSON_AVAILABLE and (
+                not ORJSON_AVAILABLE or self.data_file.stat().st_size >= _STREAMING_MIN_FILE_SIZE
+            ):
+                # orjson이 없거나 파일이 매우 클 때만 스트리밍 로드 (ijson 설치 시)
+                mattresses = self._load_streaming()
+            else:
+                mattresses = None
             
-            # 데이터 구조에 따라 매트리스 리스트 추출
-            if isinstance(data, dict):
-                if 'mattresses' in data:
-                    mattress_list = data['mattresses']
-                elif 'data' in data:
-                    mattress_list = data['data']
+            if mattresses is None:
+                # 전체 파일 파싱 (orjson 우선)
+                with open(self.data_file, 'rb', buffering=_READ_BUFFER_SIZE) as f:
+                    if ORJSON_AVAILABLE:
+                        # 파일을 메모리 매핑하여 바이트 복사 없이 바로 파싱
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                            data = orjson.loads(view)
+                    else:
+                        data = json.loads(f.read())
+                
+                # 데이터 구조에 따라 매트리스 리스트 추출
+                if isinstance(data, dict):
+                    # 우선순위대로 첫 번째로 존재하는 키 사용,
+                    # 없으면 딕셔너리 자체가 하나의 매트리스인 경우
+                    mattress_list = next(
+                        (data[key] for key in _MATTRESS_LIST_KEYS if key in data), [data]
+                    )
+                elif isinstance(data, list):
+                    mattress_list = data
                 else:
-                    # 딕셔너리 자체가 하나의 매트리스인 경우
-                    mattress_list = [data]
-            elif isinstance(data, list):
-                mattress_list = data
-            else:
-                logger.error("지원하지 않는 데이터 형식입니다")
-                return False
+                    logger.error("지원하지 않는 데이터 형식입니다")
+                    return False
+                
+                # 가격 정규화 적용
+                mattresses = self._normalize_mattress_prices(mattress_list)
             
-            # 가격 정규화 적용
-            self.mattresses = self._normalize_mattress_prices(mattress_list)
+            self.mattresses = mattresses
+            self._statistics_cache = None  # 데이터가 바뀌었으므로 통계 재계산 필요
+            
+            # ID 인덱스 / 열 단위 데이터 구축
+            self._build_id_index()
+            self._build_columns()
             
             logger.info(f"매트리스 데이터 로드 완료: {len(self.mattresses)}개")
             return True
             
+        except FileNotFoundError:
+            # exists() 사전 확인 대신 open 실패로 판단 (stat 시스템 콜 1회 절약)
+            logger.error(f"데이터 파일을 찾을 수 없습니다: {self.data_file}")
+            return False
         except Exception as e:
             logger.error(f"매트리스 데이터 로드 실패: {e}")
             return False
 
+    def _build_id_index(self):
+        """
+        RAG ID → 매트리스 인덱스 구축
+        
+        preprocess_for_rag와 동일한 규칙(중복 시 접미사 부여)으로 ID를 생성하여
+        각 매트리스의 '_rag_id'에 저장하고, ID 조회용 딕셔너리를 만듭니다.
+        """
+        self._id_to_mattress = {}
+        self._source_id_to_mattress = {}
+        collision_counter = {}
+        
+        for mattress in self.mattresses:
+            mattress_id = self._generate_unique_id(
+                mattress, self._id_to_mattress.keys(), collision_counter
+            )
+            mattress['_rag_id'] = mattress_id
+            self._id_to_mattress[mattress_id] = mattress
+            
+            # 원본 데이터의 'id'로도 조회 가능하도록 (중복 시 첫 번째 유지)
+            source_id = mattress.get('id')
+            if source_id is not None:
+                self._source_id_to_mattress.setdefault(str(source_id), mattress)
+        
+        logger.info(f"ID 인덱스 구축 완료: {len(self._id_to_mattress)}개")
+
+    def _build_columns(self):
+        """
+        집계용 열 단위(SoA) 데이터 구축
+        
+        통계 등 전체 집계 시 레코드마다 딕셔너리를 조회하지 않도록
+        가격은 NumPy 배열로, 브랜드/타입은 리스트로 분리해 둡니다.
+        """
+        mattresses = self.mattresses
+        self._columns = {
+            'price': np.fromiter(
+                (m.get('price', 0.0) for m in mattresses), dtype=np.float64, count=len(mattresses)
+            ),  # 만원 단위 (로드 시 숫자로 정규화됨)
+            'brand': [m.get('brand', '') for m in mattresses],
+            'type': [m.get('type', '') for m in mattresses],
+        }
+
     def get_mattresses(self) -> List[Dict]:
         """
         로드된 매트리스 데이터 반환
         
+        복사 없이 내부 리스트를 그대로 반환하므로 읽기 전용으로 사용하세요.
+        
         Returns:
             List[Dict]: 매트리스 데이터 리스트
         """
@@ -295,94 +493,111 @@ class MattressDataLoader:
         """
         ID로 특정 매트리스 조회
         
+        RAG ID(ChromaDB 문서 ID)를 먼저 찾고, 없으면 원본 데이터의 'id'로 찾습니다.
+        복사 없이 내부 레코드를 그대로 반환하므로 읽기 전용으로 사용하세요.
+        
         Args:
             mattress_id: 매트리스 ID
             
         Returns:
             Optional[Dict]: 매트리스 정보, 없으면 None
         """
-        # 정규화된 ID로 검색
-        for mattress in self.mattresses:
-            # 생성된 ID 패턴으로 검색
-            generated_id = self._generate_unique_id(mattress, set())
-            if generated_id == mattress_id:
-                return mattress
-        
-        return None
+        mattress = self._id_to_mattress.get(mattress_id)
+        if mattress is None:
+            mattress = self._source_id_to_mattress.get(mattress_id)
+        return mattress
 
-    def preprocess_for_rag(self) -> List[Dict]:
-        """
-        RAG 시스템용 데이터 전처리 (ChromaDB 호환성 강화)
+    def iter_rag_records(self) -> Iterator[Dict]:
         """
-        if not self.mattresses:
-            logger.warning("매트리스 데이터가 없습니다")
-            return []
+        RAG 시스템용 레코드를 하나씩 생성 (ChromaDB 호환성 강화)
+        
+        전체 리스트를 만들지 않고 레코드를 하나씩 반환합니다.
+        ID는 _generate_unique_id가 existing_ids 기준으로 고유성을 보장하므로
+        별도의 중복 검사는 하지 않습니다.
         
-        rag_data = []
+        Yields:
+            Dict: {'id', 'search_text', 'metadata'} 형식의 RAG 레코드
+        """
         existing_ids = set()
+        collision_counter = {}
+        duplicate_count = 0
+        
+        # 루프 불변 속성 조회를 지역 변수로 끌어올림
+        features_prefix = self._FEATURES_PREFIX
+        target_users_prefix = self._TARGET_USERS_PREFIX
+        description_prefix = self._DESCRIPTION_PREFIX
+        generate_unique_id = self._generate_unique_id
+        id_to_mattress = self._id_to_mattress
         
         for i, mattress in enumerate(self.mattresses):
             try:
-                # 고유 ID 생성
-                mattress_id = self._generate_unique_id(mattress, existing_ids)
+                # 고유 ID (로드 시 생성된 ID 재사용, 없을 때만 생성)
+                mattress_id = mattress.get('_rag_id')
+                if not mattress_id or mattress_id in existing_ids:
+                    mattress_id = generate_unique_id(mattress, existing_ids, collision_counter)
+                    mattress['_rag_id'] = mattress_id
+                    id_to_mattress[mattress_id] = mattress
                 existing_ids.add(mattress_id)
                 
-                # 검색용 텍스트 생성 (가격은 만원 단위 사용)
-                search_text_parts = []
+                get = mattress.get
                 
-                # 기본 정보
-                search_text_parts.append(f"매트리스 이름: {mattress.get('name', '')}")
-                search_text_parts.append(f"브랜드: {mattress.get('brand', '')}")
-                search_text_parts.append(f"타입: {mattress.get('type', '')}")
-                search_text_parts.append(f"가격: {mattress.get('price', 0)}만원")  # 만원 단위
+                # 특징 / 추천 사용자 (로드 시 튜플 정규화 및 결합 텍스트 캐시됨)
+                features = get('features', ())
+                features_text = get('_features_text')
+                if features_text is None:
+                    features_text = ', '.join(map(str, features))
                 
-                # 특징
-                features = mattress.get('features', [])
-                if isinstance(features, list) and features:
-                    search_text_parts.append(f"특징: {', '.join(str(f) for f in features)}")
+                target_users = get('target_users', ())
+                target_users_text = get('_target_users_text')
+                if target_users_text is None:
+                    target_users_text = ', '.join(map(str, target_users))
                 
-                # 추천 사용자
-                target_users = mattress.get('target_users', [])
-                if isinstance(target_users, list) and target_users:
-                    search_text_parts.append(f"추천 대상: {', '.join(str(t) for t in target_users)}")
+                name = str(get('name', ''))
+                brand = str(get('brand', ''))
+                mattress_type = str(get('type', ''))
+                price = get('price', 0)
                 
                 # 설명
-                description = mattress.get('description', '')
-                if description:
-                    search_text_parts.append(f"설명: {description}")
-                
-                search_text = ' '.join(search_text_parts)
+                description = get('description', '')
                 
-                # 메타데이터 준비 (ChromaDB 호환 타입으로)
-                features_text = ', '.join(str(f) for f in features) if features else ''
-                target_users_text = ', '.join(str(t) for t in target_users) if target_users else ''
+                # 검색용 텍스트 생성 (가격은 만원 단위 사용)
+                # 필수 항목은 f-string 한 번으로, 선택 항목은 있을 때만 이어붙임
+                search_text = (
+                    f"매트리스 이름: {name} 브랜드: {brand} 타입: {mattress_type} 가격: {price}만원"
+                    f"{features_prefix + features_text if features_text else ''}"
+                    f"{target_users_prefix + target_users_text if target_users_text else ''}"
+                    f"{description_prefix + str(description) if description else ''}"
+                )
                 
-                raw_metadata = {
-                    'name': str(mattress.get('name', '')),
-                    'brand': str(mattress.get('brand', '')),
-                    'type': str(mattress.get('type', '')),
-                    'price': float(mattress.get('price', 0)),  # 만원 단위
-                    'price_won': int(mattress.get('price_won', 0)),  # 원 단위
-                    'features_text': features_text,
-                    'target_users_text': target_users_text,
-                    'features_count': len(features) if features else 0,
-                    'target_users_count': len(target_users) if target_users else 0
+                # 메타데이터 (ChromaDB 호환 타입으로 직접 구성, 문자열은 strip만 적용)
+                metadata = {
+                    'name': name.strip(),
+                    'brand': brand.strip(),
+                    'type': mattress_type.strip(),
+                    'price': float(price),  # 만원 단위
+                    'price_won': int(get('price_won', 0)),  # 원 단위
+                    'features_text': features_text.strip(),
+                    'target_users_text': target_users_text.strip(),
+                    'features_count': len(features),
+                    'target_users_count': len(target_users)
                 }
                 
-                # 메타데이터 검증
-                metadata = self._validate_metadata(raw_metadata)
-                
-                rag_data.append({
+                record = {
                     'id': mattress_id,
                     'search_text': search_text,
                     'metadata': metadata
-                })
+                }
                 
             except Exception as e:
                 logger.error(f"매트리스 {i} 전처리 실패: {e}")
                 # 기본 데이터로라도 추가
                 fallback_id = f"mattress_fallback_{i}"
-                rag_data.append({
+                if fallback_id in existing_ids:
+                    duplicate_count += 1
+                    continue
+                existing_ids.add(fallback_id)
+                
+                record = {
                     'id': fallback_id,
                     'search_text': f"매트리스 {i}",
                     'metadata': {
@@ -396,69 +611,103 @@ class MattressDataLoader:
                         'features_count': 0,
                         'target_users_count': 0
                     }
-                })
+                }
+            
+            yield record
         
-        logger.info(f"RAG용 데이터 전처리 완료: {len(rag_data)}개 (ChromaDB 호환성 강화)")
+        if duplicate_count:
+            logger.warning(f"중복 ID 제외: {duplicate_count}개")
+    
+    def preprocess_for_rag(self) -> List[Dict]:
+        """
+        RAG 시스템용 데이터 전처리 (ChromaDB 호환성 강화)
+        """
+        if not self.mattresses:
+            logger.warning("매트리스 데이터가 없습니다")
+            return []
         
-        # 중복 ID 최종 확인
-        ids = [item['id'] for item in rag_data]
-        unique_ids = set(ids)
-        if len(ids) != len(unique_ids):
-            logger.warning(f"중복 ID 발견: {len(ids) - len(unique_ids)}개")
-            
-            # 중복 제거
-            seen_ids = set()
-            deduplicated_data = []
-            for item in rag_data:
-                if item['id'] not in seen_ids:
-                    seen_ids.add(item['id'])
-                    deduplicated_data.append(item)
-            
-            logger.info(f"중복 제거 후: {len(deduplicated_data)}개")
-            return deduplicated_data
+        rag_data = list(self.iter_rag_records())
         
+        logger.info(f"RAG용 데이터 전처리 완료: {len(rag_data)}개 (ChromaDB 호환성 강화)")
         return rag_data
 
+    def preprocess_for_rag_batched(self, batch_size: int = 1000) -> Iterator[Tuple[List[str], List[str], List[Dict]]]:
+        """
+        RAG 시스템용 데이터를 배치 단위로 생성
+
+        임베딩 모델 / ChromaDB collection.add에 바로 넘길 수 있도록
+        (ids, documents, metadatas) 리스트 묶음으로 반환합니다.
+        전체 레코드 리스트를 만들지 않으므로 RAG 시스템 초기화(색인)에서 사용합니다.
+
+        Args:
+            batch_size: 배치당 레코드 수 (기본값은 색인 묶음 크기와 같은 1000)
+
+        Yields:
+            Tuple[List[str], List[str], List[Dict]]: (ids, documents, metadatas)
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size는 1 이상이어야 합니다: {batch_size}")
+
+        if not self.mattresses:
+            logger.warning("매트리스 데이터가 없습니다")
+            return
+
+        pending_ids, pending_texts, pending_metadatas = [], [], []
+
+        for record in self.iter_rag_records():
+            pending_ids.append(record['id'])
+            pending_texts.append(record['search_text'])
+            pending_metadatas.append(record['metadata'])
+
+            if len(pending_ids) == batch_size:
+                yield pending_ids, pending_texts, pending_metadatas
+                pending_ids, pending_texts, pending_metadatas = [], [], []
+
+        # 남은 레코드
+        if pending_ids:
+            yield pending_ids, pending_texts, pending_metadatas
+
     def get_statistics(self) -> Dict:
         """
         데이터 통계 정보 반환
         
+        결과는 데이터를 다시 로드할 때까지 캐시되므로 반환값은 읽기 전용으로 사용하세요.
+        
         Returns:
             Dict: 통계 정보
         """
         if not self.mattresses:
             return {"error": "데이터가 로드되지 않았습니다"}
         
+        if self._statistics_cache is not None:
+            return self._statistics_cache
+        
         try:
-            # 가격 통계 (만원 단위)
-            prices = [m.get('price', 0) for m in self.mattresses if isinstance(m.get('price'), (int, float))]
+            # 열 단위 데이터로 가격 / 브랜드 / 타입 집계
+            if self._columns is None:
+                self._build_columns()
+            columns = self._columns
             
-            # 브랜드 통계
-            brands = [m.get('brand', '') for m in self.mattresses]
-            brand_counts = {}
-            for brand in brands:
-                if brand:
-                    brand_counts[brand] = brand_counts.get(brand, 0) + 1
+            brand_counts = Counter(filter(None, columns['brand']))
+            type_counts = Counter(filter(None, columns['type']))
             
-            # 타입 통계
-            types = [m.get('type', '') for m in self.mattresses]
-            type_counts = {}
-            for mattress_type in types:
-                if mattress_type:
-                    type_counts[mattress_type] = type_counts.get(mattress_type, 0) + 1
+            # 가격 통계 (벡터 연산)
+            price_array = columns['price']
+            has_prices = price_array.size > 0
             
-            return {
+            self._statistics_cache = {
                 'total_mattresses': len(self.mattresses),
                 'price_stats': {
-                    'min': min(prices) if prices else 0,
-                    'max': max(prices) if prices else 0,
-                    'avg': sum(prices) / len(prices) if prices else 0,
+                    'min': float(price_array.min()) if has_prices else 0,
+                    'max': float(price_array.max()) if has_prices else 0,
+                    'avg': float(price_array.mean()) if has_prices else 0,
                     'unit': '만원'
                 },
-                'brand_distribution': brand_counts,
-                'type_distribution': type_counts,
-                'valid_prices': len(prices)
+                'brand_distribution': dict(brand_counts.most_common()),
+                'type_distribution': dict(type_counts.most_common()),
+                'valid_prices': int(price_array.size)
             }
+            return self._statistics_cache
         except Exception as e:
             logger.error(f"통계 생성 실패: {e}")
             return {"error": f"통계 생성 실패: {str(e)}"}
@@ -10,23 +10,200 @@ Few-shot 학습 강화 - 유사도 극대화 버전 (고객 표기 수정 완료
 5. "고객" 표기 정확성 개선
 """
 
+import asyncio
+import atexit
 import json
 import re
+import string
 import logging
-from typing import Dict, List, Optional, Tuple, Union, Any
+import functools
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple, Union, Any
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# 시맨틱 캐시 설정
+SEMANTIC_CACHE_THRESHOLD = 0.87  # 이 이상의 코사인 유사도면 같은 질문으로 간주
+SEMANTIC_CACHE_SIZE = 256  # 캐시 최대 항목 수 (LRU)
+SEMANTIC_CACHE_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# 배치 쿼리 확장 응답의 "번호. 텍스트" 줄 파싱
+_NUMBERED_LINE_RE = re.compile(r'^\s*(\d+)[.)]\s*(.+?)\s*$', re.MULTILINE)
+
+# 배치 쿼리 확장 시 시스템 프롬프트에 덧붙이는 출력 형식 지시
+_BATCH_EXPANSION_INSTRUCTION = """
+
+여러 쿼리가 번호와 함께 주어지면 각 쿼리를 위 전략으로 확장하고,
+같은 번호를 붙여 한 줄에 하나씩 확장된 텍스트만 반환하세요. (예: 1. 확장된 텍스트)"""
+
+# GPT 동의어 예시 텍스트의 "입력: ... 최적 동의어: [...]" 블록 파싱
+_SYNONYM_EXAMPLE_RE = re.compile(r'입력:\s*"([^"]+)"\s*\n최적 동의어:\s*(\[[^\]]*\])')
+
+# 질문 토큰 중 동의어 사전에 있는 비율이 이 이상이면 GPT 없이 로컬 확장
+LOCAL_EXPANSION_MIN_COVERAGE = 0.5
+
+# 검색 결과가 없을 때의 응답
+_NO_RESULT = "죄송합니다. 조건에 맞는 매트리스를 찾을 수 없습니다."
+
+# 응답 생성 컨텍스트의 추천 매트리스 정보 템플릿
+_CONTEXT_TEMPLATE = string.Template("""추천 매트리스 정보:
+- 제품명: $name
+- 브랜드: $brand
+- 가격: $price만원
+- 타입: $type
+- 주요 특징: $features
+- 추천 대상: $targets
+- 유사도 점수: $similarity
+- Enhanced 검색: $enhanced""")
+
+
+def _format_health_context(health_info: Dict) -> Optional[str]:
+    """건강 이슈 항목 (이슈가 없으면 None)"""
+    if not health_info.get('has_issue'):
+        return None
+    issues = health_info.get('issues', [])
+    severity = health_info.get('severity', 'medium')
+    return f"건강 이슈: {', '.join(issues)} (심각도: {severity})"
+
+
+def _format_budget_context(budget_info: Dict) -> Optional[str]:
+    """예산 항목 (예산 정보가 없으면 None)"""
+    if not budget_info.get('has_budget'):
+        return None
+    return f"예산: {budget_info.get('range', '')}"
+
+
+def _format_preference_context(preferences: Dict) -> Optional[str]:
+    """선호도 항목 (선호도가 없으면 None)"""
+    if not preferences:
+        return None
+    return "선호도: " + ', '.join([f"{k}: {v}" for k, v in preferences.items() if v])
+
+
+# 고객 상황 컨텍스트 항목 (의도 분석 키, 포맷 함수) - 순서대로 출력
+_USER_CONTEXT_FIELDS = (
+    ('health_info', _format_health_context),
+    ('budget_info', _format_budget_context),
+    ('preferences', _format_preference_context),
+)
+
+# GPT 응답의 마크다운 코드 펜스(```json ... ```) 제거
+_JSON_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$', re.MULTILINE)
+
+# 재사용 JSON 디코더 (앞쪽 JSON 값만 읽고 뒤따르는 텍스트는 무시)
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _parse_json_response(content: str) -> Any:
+    """GPT 응답 텍스트에서 JSON 값 파싱 (코드 펜스 허용, 실패 시 json.JSONDecodeError)"""
+    text = _JSON_FENCE_RE.sub('', content).strip()
+    value, _ = _JSON_DECODER.raw_decode(text)
+    return value
+
+
+@functools.lru_cache(maxsize=4096)
+def _tokenize(text: str) -> Tuple[str, ...]:
+    """공백 기준 토큰 분리 (같은 질문이 여러 메서드에서 반복 분리되므로 캐시)"""
+    return tuple(text.split())
+
+
+def _keyword_context_key(text: str) -> str:
+    """
+    시맨틱 캐시 컨텍스트 키용 키워드 집합 (한 글자 토큰 제외, 순서 무관)
+    
+    키워드가 같은 질문끼리만 유사도로 비교하여 '딱딱한' / '푹신한'처럼
+    한 단어만 반대인 질문이 서로의 GPT 결과를 재사용하지 않도록 합니다.
+    """
+    return ' '.join(sorted({token for token in _tokenize(text) if len(token) > 1}))
+
+
+# 의도 분석 GPT 응답 캐시 크기 (동일 질문 정확 일치)
+INTENT_CACHE_SIZE = 1024
+
+
+def _cached_prompt(build_prompt):
+    """
+    프롬프트 빌더 결과를 인스턴스별로 캐시하는 데코레이터
+    
+    Few-shot 예시는 생성 후 변경되지 않으므로 첫 호출 때만 프롬프트를 조립합니다.
+    """
+    @functools.wraps(build_prompt)
+    def wrapper(self) -> str:
+        prompt = self._prompt_cache.get(build_prompt.__name__)
+        if prompt is None:
+            prompt = build_prompt(self)
+            self._prompt_cache[build_prompt.__name__] = prompt
+        return prompt
+    return wrapper
+
 
 class EnhancedFewShotManager:
     """유사도 향상에 특화된 Few-shot 매니저"""
     
     def __init__(self):
-        self.similarity_optimization_examples = self._load_similarity_examples()
-        self.gpt_synonym_examples = self._load_gpt_synonym_examples()
-        self.query_expansion_examples = self._load_enhanced_query_expansion()
-        self.intent_analysis_examples = self._load_enhanced_intent_analysis()
-        self.response_generation_examples = self._load_enhanced_response_generation()
+        # Few-shot 예시는 처음 사용할 때 로드 (아래 cached_property 참고)
+        
+        # 프롬프트 캐시 (빌더 메서드 이름 → 프롬프트 문자열)
+        self._prompt_cache: Dict[str, str] = {}
+    
+    @functools.cached_property
+    def similarity_optimization_examples(self) -> List[Dict]:
+        """유사도 향상 전략 예시 (첫 접근 시 로드)"""
+        return self._load_similarity_examples()
+    
+    @functools.cached_property
+    def gpt_synonym_examples(self) -> str:
+        """GPT 동의어 생성 예시 (첫 접근 시 로드)"""
+        return self._load_gpt_synonym_examples()
+    
+    @functools.cached_property
+    def query_expansion_examples(self) -> List[Dict]:
+        """쿼리 확장 예시 (첫 접근 시 로드)"""
+        return self._load_enhanced_query_expansion()
+    
+    @functools.cached_property
+    def intent_analysis_examples(self) -> List[Dict]:
+        """의도 분석 예시 (첫 접근 시 로드)"""
+        return self._load_enhanced_intent_analysis()
+    
+    @functools.cached_property
+    def response_generation_examples(self) -> List[Dict]:
+        """응답 생성 예시 (첫 접근 시 로드)"""
+        return self._load_enhanced_response_generation()
+    
+    @functools.cached_property
+    def _query_expansion_synonyms_json(self) -> List[str]:
+        """쿼리 확장 예시의 동의어 JSON (예시 순서와 동일, 예시 딕셔너리는 변경하지 않음)"""
+        return [
+            json.dumps(example['step2_gpt_synonym_expansion'], ensure_ascii=False)
+            for example in self.query_expansion_examples
+        ]
+    
+    @functools.cached_property
+    def synonym_map(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        Few-shot 예시에서 추출한 로컬 동의어 사전 (토큰 → 동의어 튜플)
+        
+        GPT 동의어 예시의 "최적 동의어"와 쿼리 확장 예시의 step2 동의어를 합칩니다.
+        """
+        merged: Dict[str, Dict[str, None]] = {}
+        for word, synonyms_json in _SYNONYM_EXAMPLE_RE.findall(self.gpt_synonym_examples):
+            merged.setdefault(word, {}).update(dict.fromkeys(json.loads(synonyms_json)))
+        for example in self.query_expansion_examples:
+            for word, synonyms in example['step2_gpt_synonym_expansion'].items():
+                merged.setdefault(word, {}).update(dict.fromkeys(synonyms))
+        return {word: tuple(synonyms) for word, synonyms in merged.items()}
+    
+    @functools.cached_property
+    def _intent_analysis_json(self) -> List[str]:
+        """의도 분석 예시의 분석 JSON (예시 순서와 동일)"""
+        return [
+            json.dumps(example['enhanced_analysis'], ensure_ascii=False, indent=2)
+            for example in self.intent_analysis_examples
+        ]
     
     def _load_similarity_examples(self) -> List[Dict]:
         """유사도 향상 전략 예시"""
@@ -233,13 +410,17 @@ class EnhancedFewShotManager:
             }
         ]
 
+    @_cached_prompt
     def get_similarity_optimization_prompt(self) -> str:
         """유사도 최적화 프롬프트"""
-        examples_text = ""
+        parts: List[str] = []
         for example in self.similarity_optimization_examples:
-            examples_text += f"전략: {example['strategy']}\n"
-            examples_text += f"개선: {example['similarity_improvement']}\n"
-            examples_text += f"예시: {example['before']} → {example['after']}\n\n"
+            parts.append(
+                f"전략: {example['strategy']}\n"
+                f"개선: {example['similarity_improvement']}\n"
+                f"예시: {example['before']} → {example['after']}\n\n"
+            )
+        examples_text = "".join(parts)
         
         return f"""매트리스 검색 유사도 극대화 전문가입니다. 다음 전략을 사용하여 검색 성능을 최대한 향상시키세요.
 
@@ -258,19 +439,22 @@ GPT 동의어 생성 가이드:
 
 응답은 JSON 배열 형태로만 제공하세요."""
     
+    @_cached_prompt
     def get_enhanced_query_expansion_prompt(self) -> str:
         """강화된 쿼리 확장 프롬프트"""
-        examples_text = ""
-        for i, example in enumerate(self.query_expansion_examples, 1):
-            examples_text += f"""예시 {i}:
+        parts: List[str] = []
+        for i, (example, synonyms_json) in enumerate(
+                zip(self.query_expansion_examples, self._query_expansion_synonyms_json), 1):
+            parts.append(f"""예시 {i}:
 원본 쿼리: "{example['user_query']}"
 1단계 키워드: {example['step1_keyword_extraction']}
-2단계 동의어: {json.dumps(example['step2_gpt_synonym_expansion'], ensure_ascii=False)}
+2단계 동의어: {synonyms_json}
 3단계 맥락강화: {example['step3_context_enrichment']}
 최종 확장: "{example['step4_final_expanded_query']}"
 유사도 향상: {example['expected_similarity_boost']}
 
-"""
+""")
+        examples_text = "".join(parts)
         
         return f"""매트리스 검색 쿼리 확장 전문가입니다. 4단계 확장 전략으로 유사도를 극대화하세요.
 
@@ -285,16 +469,19 @@ GPT 동의어 생성 가이드:
 목표: 유사도 +0.2 이상 향상
 확장된 텍스트만 반환하세요."""
     
+    @_cached_prompt
     def get_enhanced_intent_analysis_prompt(self) -> str:
         """강화된 의도 분석 프롬프트"""
-        examples_text = ""
-        for i, example in enumerate(self.intent_analysis_examples, 1):
-            examples_text += f"""예시 {i}:
+        parts: List[str] = []
+        for i, (example, analysis_json) in enumerate(
+                zip(self.intent_analysis_examples, self._intent_analysis_json), 1):
+            parts.append(f"""예시 {i}:
 입력: "{example['user_query']}"
 강화 분석:
-{json.dumps(example['enhanced_analysis'], ensure_ascii=False, indent=2)}
+{analysis_json}
 
-"""
+""")
+        examples_text = "".join(parts)
         
         return f"""매트리스 구매 의도 분석 전문가입니다. 유사도 최적화를 위한 세부 분석을 수행하세요.
 
@@ -308,12 +495,13 @@ GPT 동의어 생성 가이드:
 
 JSON 형식으로 정확히 분석하세요."""
     
+    @_cached_prompt
     def get_enhanced_response_generation_prompt(self) -> str:
         """강화된 응답 생성 프롬프트 (사용자 후기/평점 중심)"""
-        examples_text = ""
+        parts: List[str] = []
         for i, example in enumerate(self.response_generation_examples, 1):
             search_info = example['search_results'][0]
-            examples_text += f"""예시 {i}:
+            parts.append(f"""예시 {i}:
     질문: "{example['user_query']}"
     매트리스: {search_info['name']} ({search_info['brand']}) - {search_info['price']}만원
     유사도: {search_info['similarity_score']}
@@ -322,7 +510,8 @@ JSON 형식으로 정확히 분석하세요."""
     {example['enhanced_response']}
 
     ---
-    """
+    """)
+        examples_text = "".join(parts)
         
         return f"""15년 경력 매트리스 전문가입니다. 고객의 상황을 정확히 파악하고 최적화된 상담을 제공하세요.
 
@@ -352,98 +541,462 @@ JSON 형식으로 정확히 분석하세요."""
     - 고객님의 상황을 정확히 이해하고 맞춤형 솔루션을 제공하세요"""
 
 
+class SemanticCache:
+    """
+    질문 임베딩의 코사인 유사도 기반 GPT 결과 캐시
+    
+    같은 질문은 정확 일치로, 표현만 다른 비슷한 질문은 임베딩 유사도로 찾아
+    GPT 호출을 생략합니다. context_key가 같은 항목끼리만 비교합니다.
+    
+    임베딩은 (max_size, 차원) 크기의 미리 할당된 행렬의 슬롯에 저장하여
+    조회 시 행렬-벡터 곱 한 번으로 전체 유사도를 계산합니다.
+    비동기 메서드가 작업 스레드에서 함께 사용하므로 조회/저장은 잠금 안에서 수행합니다.
+    """
+    
+    def __init__(self, threshold: float = SEMANTIC_CACHE_THRESHOLD, max_size: int = SEMANTIC_CACHE_SIZE):
+        self.threshold = threshold
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self.clear()
+    
+    def get_exact(self, query: str, context_key: str = "") -> Optional[Any]:
+        """정확히 같은 질문의 캐시 값 조회"""
+        key = (query, context_key)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return None
+            self._slots.move_to_end(key)
+            return self._values[slot]
+    
+    def get_similar(self, embedding: np.ndarray, context_key: str = "") -> Optional[Any]:
+        """임베딩 유사도가 임계값 이상인 가장 비슷한 질문의 캐시 값 조회"""
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != embedding.shape[0]:
+                return None
+            
+            mask = self._has_vector & (self._slot_contexts == context_key)
+            if not mask.any():
+                return None
+            
+            # 정규화된 벡터끼리의 내적 = 코사인 유사도 (한 번에 계산)
+            scores = np.where(mask, self._matrix @ embedding, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            
+            key = self._slot_keys[best]
+            self._slots.move_to_end(key)
+            value = self._values[best]
+        
+        logger.info("시맨틱 캐시 적중: '%s' (유사도 %.3f)", key[0], scores[best])
+        return value
+    
+    def put(self, query: str, embedding: Optional[np.ndarray], value: Any, context_key: str = ""):
+        """캐시 저장 (임베딩이 없으면 정확 일치로만 조회됨)"""
+        key = (query, context_key)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                if not self._free_slots:
+                    # 가장 오래 사용되지 않은 항목의 슬롯 재사용
+                    _, evicted_slot = self._slots.popitem(last=False)
+                    self._free_slots.append(evicted_slot)
+                slot = self._free_slots.pop()
+                self._slots[key] = slot
+            else:
+                self._slots.move_to_end(key)
+            
+            self._values[slot] = value
+            self._slot_keys[slot] = key
+            self._slot_contexts[slot] = context_key
+            
+            if embedding is None:
+                self._has_vector[slot] = False
+                return
+            
+            if self._matrix is None or self._matrix.shape[1] != embedding.shape[0]:
+                # 첫 임베딩(또는 차원 변경) 시 행렬 할당
+                self._matrix = np.zeros((self.max_size, embedding.shape[0]), dtype=np.float32)
+                self._has_vector[:] = False
+            self._matrix[slot] = embedding
+            self._has_vector[slot] = True
+    
+    def clear(self):
+        """캐시 초기화"""
+        with self._lock:
+            # (질문, 컨텍스트 키) → 슬롯 번호, LRU 순서
+            self._slots: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+            self._free_slots: List[int] = list(range(self.max_size - 1, -1, -1))
+            self._values: List[Any] = [None] * self.max_size
+            self._slot_keys: List[Optional[Tuple[str, str]]] = [None] * self.max_size
+            self._slot_contexts = np.full(self.max_size, None, dtype=object)
+            self._has_vector = np.zeros(self.max_size, dtype=bool)
+            self._matrix: Optional[np.ndarray] = None
+
+
+# 프로세스 공유 OpenAI 클라이언트 (API 키 → 클라이언트, 커넥션 풀 공유)
+_SHARED_OPENAI_CLIENTS: Dict[str, Any] = {}
+_SHARED_OPENAI_CLIENTS_LOCK = threading.Lock()
+
+# 공유 클라이언트 커넥션 풀 설정
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 20
+OPENAI_MAX_CONNECTIONS = 50
+
+# 429 / 5xx / 연결 오류 시 openai 클라이언트의 지수 백오프 재시도 횟수
+OPENAI_MAX_RETRIES = 3
+
+
+def _create_http_client():
+    """HTTP/2 keep-alive 커넥션 풀 (h2 패키지가 없으면 None → openai 기본 HTTP 클라이언트)"""
+    try:
+        import h2  # noqa: F401  (httpx HTTP/2 지원에 필요)
+        import httpx
+    except ImportError:
+        return None
+    
+    try:
+        from openai import DefaultHttpxClient as HttpClient  # openai 기본 타임아웃 유지
+    except ImportError:
+        HttpClient = httpx.Client
+    
+    return HttpClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=OPENAI_MAX_CONNECTIONS
+        )
+    )
+
+
+def _get_openai_client(api_key: Optional[str], owner: str):
+    """
+    API 키별 공유 OpenAI 클라이언트 (openai 패키지는 첫 호출 시 import), 실패 시 None
+    
+    쿼리 프로세서와 응답 생성기가 같은 커넥션 풀을 쓰도록 키마다 한 번만 생성합니다.
+    여러 스레드가 동시에 처음 호출해도 잠금 안에서 다시 확인하므로 한 번만 생성되고,
+    생성된 클라이언트는 프로세스 종료 시 닫힙니다.
+    """
+    if not api_key:
+        return None
+    
+    client = _SHARED_OPENAI_CLIENTS.get(api_key)
+    if client is not None:
+        return client
+    
+    with _SHARED_OPENAI_CLIENTS_LOCK:
+        client = _SHARED_OPENAI_CLIENTS.get(api_key)
+        if client is not None:
+            return client
+        
+        try:
+            from openai import OpenAI
+            client = OpenAI(
+                api_key=api_key,
+                http_client=_create_http_client(),
+                max_retries=OPENAI_MAX_RETRIES
+            )
+        except Exception as e:
+            logger.error("OpenAI 클라이언트 초기화 실패: %s", e)
+            return None
+        
+        _SHARED_OPENAI_CLIENTS[api_key] = client
+        atexit.register(client.close)
+        logger.info("%s OpenAI 클라이언트 초기화 완료", owner)
+        return client
+
+
+def _embed_text(client, text: str) -> Optional[np.ndarray]:
+    """시맨틱 캐시용 텍스트 임베딩 (단위 벡터), 실패 시 None"""
+    try:
+        response = client.embeddings.create(model=SEMANTIC_CACHE_EMBEDDING_MODEL, input=text)
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+    except Exception as e:
+        logger.warning("시맨틱 캐시 임베딩 실패 (정확 일치만 사용): %s", e)
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_few_shot_manager() -> EnhancedFewShotManager:
+    """
+    프로세스 전체에서 공유하는 Few-shot 매니저 반환
+    
+    예시 로드와 프롬프트 조립을 한 번만 수행하도록 첫 호출 시 생성합니다.
+    공유 인스턴스이므로 예시 데이터는 읽기 전용으로 사용하세요.
+    """
+    return EnhancedFewShotManager()
+
+
 class EnhancedOpenAIQueryProcessor:
     """Few-shot + GPT 동의어 강화 쿼리 프로세서"""
     
     def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
-        self.client = None
         self.model = model
         
-        # OpenAI 클라이언트 초기화
-        if api_key:
-            try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=api_key)
-                logger.info("Enhanced 쿼리 프로세서 OpenAI 클라이언트 초기화 완료")
-            except Exception as e:
-                logger.error(f"OpenAI 클라이언트 초기화 실패: {e}")
+        # OpenAI 클라이언트는 처음 사용할 때 생성 (client 프로퍼티)
+        self._api_key = api_key
+        self._client = None
+        self._client_initialized = False
+        
+        # Enhanced Few-shot 매니저 (프로세스 공유 인스턴스)
+        self.few_shot_manager = get_shared_few_shot_manager()
         
-        # Enhanced Few-shot 매니저
-        self.few_shot_manager = EnhancedFewShotManager()
+        # 쿼리 확장 결과 시맨틱 캐시 (질문 → 확장된 쿼리)
+        self.expansion_cache = SemanticCache()
+        
+        # 의도 분석 GPT 원문 응답 캐시 (질문 → JSON 파싱에 성공한 응답 텍스트, 정확 일치만 사용)
+        self.intent_cache = SemanticCache(max_size=INTENT_CACHE_SIZE)
+    
+    @property
+    def client(self):
+        """OpenAI 클라이언트 (첫 접근 시 생성, API 키가 없거나 실패하면 None)"""
+        if not self._client_initialized:
+            self._client = _get_openai_client(self._api_key, "Enhanced 쿼리 프로세서")
+            self._client_initialized = True
+        return self._client
+    
+    @client.setter
+    def client(self, value):
+        self._client = value
+        self._client_initialized = True
+    
+    def expand_query_locally(self, user_query: str) -> Optional[Dict[str, Any]]:
+        """
+        Few-shot 동의어 사전으로 GPT 없이 쿼리 확장
+        
+        질문 토큰 중 사전에 있는 비율이 LOCAL_EXPANSION_MIN_COVERAGE 미만이면
+        None을 반환합니다 (GPT 확장 필요).
+        """
+        tokens = _tokenize(user_query)
+        if not tokens:
+            return None
+        
+        synonym_map = self.few_shot_manager.synonym_map
+        known = [synonym_map[token] for token in tokens if token in synonym_map]
+        if len(known) < len(tokens) * LOCAL_EXPANSION_MIN_COVERAGE:
+            return None
+        
+        # 원문 뒤에 동의어를 덧붙이는 GPT 확장(step4)과 같은 형식
+        expanded_query = " ".join([user_query, *(synonym for synonyms in known for synonym in synonyms)])
+        return self._build_expansion_result(user_query, expanded_query, enhancement_type='local_dict')
     
     def expand_query_with_enhanced_gpt(self, user_query: str) -> Dict[str, Any]:
-        """GPT + Few-shot 강화 쿼리 확장"""
+        """GPT + Few-shot 강화 쿼리 확장 (동의어 사전으로 충분하면 GPT 생략)"""
+        local_result = self.expand_query_locally(user_query)
+        if local_result is not None:
+            return local_result
+        
         if not self.client:
             return self._fallback_expansion(user_query)
         
         try:
-            system_prompt = self.few_shot_manager.get_enhanced_query_expansion_prompt()
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"확장할 쿼리: '{user_query}'"}
-                ],
-                max_tokens=300,
-                temperature=0.4
-            )
+            # 시맨틱 캐시 조회 (정확 일치 → 키워드가 같은 질문 중 임베딩 유사도)
+            # (캐시 미스마다 GPT 호출 전에 임베딩 API 요청이 한 번 추가됨)
+            context_key = _keyword_context_key(user_query)
+            embedding = None
+            expanded_query = self.expansion_cache.get_exact(user_query, context_key)
+            if expanded_query is None:
+                embedding = _embed_text(self.client, user_query)
+                if embedding is not None:
+                    expanded_query = self.expansion_cache.get_similar(embedding, context_key)
             
-            expanded_query = response.choices[0].message.content.strip()
+            if expanded_query is None:
+                system_prompt = self.few_shot_manager.get_enhanced_query_expansion_prompt()
+                
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": f"확장할 쿼리: '{user_query}'"}
+                    ],
+                    max_tokens=300,
+                    temperature=0.4
+                )
+                
+                expanded_query = response.choices[0].message.content.strip()
+                self.expansion_cache.put(user_query, embedding, expanded_query, context_key)
             
-            # 추가 구조화 정보 추출
-            keywords = user_query.split()
-            
-            return {
-                'original_query': user_query,
-                'expanded_query': expanded_query,
-                'extracted_keywords': keywords,
-                'enhancement_type': 'gpt_few_shot',
-                'expected_similarity_boost': 0.25,
-                'search_terms': [user_query, expanded_query],
-                'enhanced': True
-            }
+            return self._build_expansion_result(user_query, expanded_query)
             
         except Exception as e:
-            logger.error(f"Enhanced 쿼리 확장 실패: {e}")
+            logger.error("Enhanced 쿼리 확장 실패: %s", e)
             return self._fallback_expansion(user_query)
     
+    def expand_queries_batch(self, user_queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        여러 쿼리를 GPT 한 번 호출로 확장
+        
+        Few-shot 시스템 프롬프트를 쿼리마다 반복 전송하지 않도록 캐시에 없는 쿼리를
+        번호를 붙여 한 요청에 묶습니다. 응답 파싱에 실패하면 쿼리별로 개별 확장합니다.
+        
+        Args:
+            user_queries: 확장할 쿼리 리스트
+            
+        Returns:
+            List[Dict[str, Any]]: 입력 순서대로의 확장 결과
+        """
+        if not self.client:
+            return [self._fallback_expansion(query) for query in user_queries]
+        
+        results: Dict[int, Dict[str, Any]] = {}
+        pending: List[Tuple[int, str]] = []
+        
+        # 로컬 동의어 사전, 정확 일치 캐시 우선
+        for i, query in enumerate(user_queries):
+            local_result = self.expand_query_locally(query)
+            if local_result is not None:
+                results[i] = local_result
+                continue
+            
+            cached = self.expansion_cache.get_exact(query, _keyword_context_key(query))
+            if cached is not None:
+                results[i] = self._build_expansion_result(query, cached)
+            else:
+                pending.append((i, query))
+        
+        expansions = None
+        if len(pending) > 1:
+            try:
+                system_prompt = (
+                    self.few_shot_manager.get_enhanced_query_expansion_prompt()
+                    + _BATCH_EXPANSION_INSTRUCTION
+                )
+                numbered_queries = "\n".join(f"{n}. {query}" for n, (_, query) in enumerate(pending, 1))
+                
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": f"확장할 쿼리 목록:\n{numbered_queries}"}
+                    ],
+                    max_tokens=300 * len(pending),
+                    temperature=0.4
+                )
+                
+                expansions = self._parse_numbered_lines(
+                    response.choices[0].message.content, len(pending)
+                )
+                if expansions is None:
+                    logger.warning("배치 쿼리 확장 응답 파싱 실패, 개별 확장으로 전환")
+                    
+            except Exception as e:
+                logger.error("배치 쿼리 확장 실패, 개별 확장으로 전환: %s", e)
+        
+        for n, (i, query) in enumerate(pending):
+            if expansions is None:
+                results[i] = self.expand_query_with_enhanced_gpt(query)
+            else:
+                self.expansion_cache.put(query, None, expansions[n], _keyword_context_key(query))
+                results[i] = self._build_expansion_result(query, expansions[n])
+        
+        return [results[i] for i in range(len(user_queries))]
+    
+    @staticmethod
+    def _parse_numbered_lines(text: str, count: int) -> Optional[List[str]]:
+        """'번호. 텍스트' 형식 응답을 1..count 순서 리스트로 변환 (누락 시 None)"""
+        by_number = {}
+        for number, line in _NUMBERED_LINE_RE.findall(text):
+            by_number.setdefault(int(number), line)
+        
+        if any(n not in by_number for n in range(1, count + 1)):
+            return None
+        return [by_number[n] for n in range(1, count + 1)]
+    
+    def _build_expansion_result(self, user_query: str, expanded_query: str,
+                                enhancement_type: str = 'gpt_few_shot') -> Dict[str, Any]:
+        """확장된 쿼리로 결과 딕셔너리 구성"""
+        # 추가 구조화 정보 추출
+        keywords = list(_tokenize(user_query))
+        
+        return {
+            'original_query': user_query,
+            'expanded_query': expanded_query,
+            'extracted_keywords': keywords,
+            'enhancement_type': enhancement_type,
+            'expected_similarity_boost': 0.25,
+            'search_terms': [user_query, expanded_query],
+            'enhanced': True
+        }
+    
     def analyze_intent_with_optimization(self, user_query: str) -> Dict:
         """최적화 정보 포함 의도 분석"""
         if not self.client:
             return self._basic_intent_analysis(user_query)
         
         try:
-            system_prompt = self.few_shot_manager.get_enhanced_intent_analysis_prompt()
+            content = self.intent_cache.get_exact(user_query)
+            if content is None:
+                content = self._request_intent_analysis(user_query)
+                self.intent_cache.put(user_query, None, content)
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"분석할 질문: '{user_query}'"}
-                ],
-                max_tokens=500,
-                temperature=0.2
-            )
+            # 캐시된 원문에서 매번 새로 파싱 (호출자가 결과를 수정해도 캐시 안전)
+            intent = _parse_json_response(content)
+            intent['enhanced_few_shot'] = True
+            return intent
             
-            try:
-                intent = json.loads(response.choices[0].message.content.strip())
-                intent['enhanced_few_shot'] = True
-                return intent
-            except json.JSONDecodeError:
-                logger.error("Enhanced 의도 분석 JSON 파싱 실패")
-                
+        except json.JSONDecodeError:
+            logger.error("Enhanced 의도 분석 JSON 파싱 실패")
         except Exception as e:
-            logger.error(f"Enhanced 의도 분석 실패: {e}")
+            logger.error("Enhanced 의도 분석 실패: %s", e)
         
         return self._basic_intent_analysis(user_query)
     
+    async def aexpand_query(self, user_query: str) -> Dict[str, Any]:
+        """expand_query_with_enhanced_gpt의 비동기 버전 (작업 스레드에서 실행)"""
+        return await asyncio.to_thread(self.expand_query_with_enhanced_gpt, user_query)
+    
+    async def aanalyze_intent(self, user_query: str) -> Dict:
+        """analyze_intent_with_optimization의 비동기 버전 (작업 스레드에서 실행)"""
+        return await asyncio.to_thread(self.analyze_intent_with_optimization, user_query)
+    
+    async def aexpand_and_analyze(self, user_query: str) -> Tuple[Dict[str, Any], Dict]:
+        """
+        쿼리 확장과 의도 분석을 동시에 실행
+        
+        두 GPT 호출은 서로 독립적이므로 병렬로 보내 대기 시간을 합이 아닌 최댓값으로 줄입니다.
+        동기 클라이언트와 캐시를 그대로 사용합니다.
+        
+        Returns:
+            Tuple[Dict[str, Any], Dict]: (쿼리 확장 결과, 의도 분석 결과)
+        """
+        expansion, intent = await asyncio.gather(
+            self.aexpand_query(user_query),
+            self.aanalyze_intent(user_query)
+        )
+        return expansion, intent
+    
+    def _request_intent_analysis(self, user_query: str) -> str:
+        """
+        의도 분석 GPT 호출 (응답 원문 반환)
+        
+        JSON 객체로 파싱되지 않는 응답은 json.JSONDecodeError를 발생시켜 캐시되지 않도록 합니다.
+        """
+        system_prompt = self.few_shot_manager.get_enhanced_intent_analysis_prompt()
+        
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"분석할 질문: '{user_query}'"}
+            ],
+            max_tokens=500,
+            temperature=0.2,
+            response_format={"type": "json_object"}  # 코드 펜스 없는 순수 JSON 응답
+        )
+        
+        content = response.choices[0].message.content.strip()
+        if not isinstance(_parse_json_response(content), dict):
+            raise json.JSONDecodeError("JSON 객체가 아닌 응답", content, 0)
+        return content
+    
     def _fallback_expansion(self, user_query: str) -> Dict[str, Any]:
         """폴백 확장"""
         return {
             'original_query': user_query,
             'expanded_query': user_query,
-            'extracted_keywords': user_query.split(),
+            'extracted_keywords': list(_tokenize(user_query)),
             'enhancement_type': 'fallback',
             'expected_similarity_boost': 0.0,
             'search_terms': [user_query],
@@ -464,95 +1017,175 @@ class EnhancedOpenAIResponseGenerator:
     """Few-shot 강화 응답 생성기 (고객 표기 수정)"""
     
     def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
-        self.client = None
         self.model = model
         
-        # OpenAI 클라이언트 초기화
-        if api_key:
-            try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=api_key)
-                logger.info("Enhanced 응답 생성기 OpenAI 클라이언트 초기화 완료")
-            except Exception as e:
-                logger.error(f"OpenAI 클라이언트 초기화 실패: {e}")
+        # OpenAI 클라이언트는 처음 사용할 때 생성 (client 프로퍼티)
+        self._api_key = api_key
+        self._client = None
+        self._client_initialized = False
         
-        # Enhanced Few-shot 매니저
-        self.few_shot_manager = EnhancedFewShotManager()
+        # Enhanced Few-shot 매니저 (프로세스 공유 인스턴스)
+        self.few_shot_manager = get_shared_few_shot_manager()
+        
+        # 응답 시맨틱 캐시 (추천 컨텍스트가 같은 비슷한 질문끼리만 재사용)
+        self.response_cache = SemanticCache()
+    
+    @property
+    def client(self):
+        """OpenAI 클라이언트 (첫 접근 시 생성, API 키가 없거나 실패하면 None)"""
+        if not self._client_initialized:
+            self._client = _get_openai_client(self._api_key, "Enhanced 응답 생성기")
+            self._client_initialized = True
+        return self._client
+    
+    @client.setter
+    def client(self, value):
+        self._client = value
+        self._client_initialized = True
     
     def generate_enhanced_response(self, user_query: str, search_results: List[Dict], 
                                  user_intent: Optional[Dict] = None,
                                  query_expansion: Optional[Dict] = None) -> str:
         """Few-shot 강화 응답 생성 (고객 표기 수정)"""
+        if not search_results:
+            return _NO_RESULT
+        
         if not self.client:
             return self._generate_fallback_response(user_query, search_results)
         
-        if not search_results:
-            return "죄송합니다. 조건에 맞는 매트리스를 찾을 수 없습니다."
-        
         try:
-            # Few-shot 강화 시스템 프롬프트 (고객 표기 수정 포함)
-            system_prompt = self.few_shot_manager.get_enhanced_response_generation_prompt()
+            # 시맨틱 캐시 조회 (추천 제품/고객 상황이 같을 때만 재사용)
+            context_key = self._build_response_context(search_results, user_intent)
+            final_response = self.response_cache.get_exact(user_query, context_key)
+            if final_response is not None:
+                return final_response
             
-            # 검색 결과 컨텍스트 (상위 결과 중심)
-            top_mattress = search_results[0]
-            context = f"""추천 매트리스 정보:
-- 제품명: {top_mattress.get('name', 'Unknown')}
-- 브랜드: {top_mattress.get('brand', 'Unknown')}
-- 가격: {top_mattress.get('price', 0)}만원
-- 타입: {top_mattress.get('type', 'Unknown')}
-- 주요 특징: {', '.join(top_mattress.get('features', [])[:3])}
-- 추천 대상: {', '.join(top_mattress.get('target_users', [])[:2])}
-- 유사도 점수: {top_mattress.get('similarity_score', 0):.3f}
-- Enhanced 검색: {top_mattress.get('gpt_enhanced', False)}"""
-            
-            # 사용자 컨텍스트
-            user_context = ""
-            if user_intent:
-                context_parts = []
-                
-                # 건강 정보
-                health_info = user_intent.get('health_info', {})
-                if health_info.get('has_issue'):
-                    issues = health_info.get('issues', [])
-                    severity = health_info.get('severity', 'medium')
-                    context_parts.append(f"건강 이슈: {', '.join(issues)} (심각도: {severity})")
-                
-                # 예산 정보
-                budget_info = user_intent.get('budget_info', {})
-                if budget_info.get('has_budget'):
-                    context_parts.append(f"예산: {budget_info.get('range', '')}")
-                
-                # 선호도
-                preferences = user_intent.get('preferences', {})
-                if preferences:
-                    pref_text = ', '.join([f"{k}: {v}" for k, v in preferences.items() if v])
-                    context_parts.append(f"선호도: {pref_text}")
-                
-                if context_parts:
-                    user_context = f"\n\n고객 상황:\n" + '\n'.join([f"- {part}" for part in context_parts])
+            embedding = _embed_text(self.client, user_query)
+            if embedding is not None:
+                final_response = self.response_cache.get_similar(embedding, context_key)
+                if final_response is not None:
+                    return final_response
             
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"고객 질문: \"{user_query}\"\n\n{context}{user_context}"}
-                ],
+                messages=self._build_response_messages(user_query, context_key),
                 max_tokens=500,
                 temperature=0.7
             )
             
             final_response = response.choices[0].message.content.strip()
+            self.response_cache.put(user_query, embedding, final_response, context_key)
             logger.info("Enhanced Few-shot 응답 생성 완료")
             return final_response
             
         except Exception as e:
-            logger.error(f"Enhanced 응답 생성 실패: {e}")
+            logger.error("Enhanced 응답 생성 실패: %s", e)
             return self._generate_fallback_response(user_query, search_results)
     
+    def generate_enhanced_response_stream(self, user_query: str, search_results: List[Dict],
+                                          user_intent: Optional[Dict] = None,
+                                          query_expansion: Optional[Dict] = None) -> Iterator[str]:
+        """
+        Few-shot 강화 응답을 생성되는 대로 조각 단위로 반환 (UI 표시용)
+        
+        첫 글자 표시까지의 대기 시간을 줄이기 위해 임베딩 조회 없이 정확 일치 캐시만 확인하고,
+        완료된 응답은 generate_enhanced_response와 같은 캐시에 저장합니다.
+        
+        Yields:
+            str: 응답 텍스트 조각
+        """
+        if not search_results:
+            yield _NO_RESULT
+            return
+        
+        if not self.client:
+            yield self._generate_fallback_response(user_query, search_results)
+            return
+        
+        try:
+            context_key = self._build_response_context(search_results, user_intent)
+            cached_response = self.response_cache.get_exact(user_query, context_key)
+            if cached_response is not None:
+                yield cached_response
+                return
+            
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=self._build_response_messages(user_query, context_key),
+                max_tokens=500,
+                temperature=0.7,
+                stream=True
+            )
+        except Exception as e:
+            logger.error("Enhanced 스트리밍 응답 생성 실패: %s", e)
+            yield self._generate_fallback_response(user_query, search_results)
+            return
+        
+        parts: List[str] = []
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            logger.error("Enhanced 스트리밍 응답 중단: %s", e)
+            if not parts:
+                yield self._generate_fallback_response(user_query, search_results)
+            return  # 중단된 응답은 캐시하지 않음
+        
+        final_response = "".join(parts).strip()
+        if final_response:
+            self.response_cache.put(user_query, None, final_response, context_key)
+        logger.info("Enhanced Few-shot 스트리밍 응답 생성 완료")
+    
+    def _build_response_context(self, search_results: List[Dict], user_intent: Optional[Dict]) -> str:
+        """추천 매트리스 + 고객 상황 컨텍스트 텍스트 (응답 캐시 키로도 사용)"""
+        # 검색 결과 컨텍스트 (상위 결과 중심)
+        top_mattress = search_results[0]
+        context = _CONTEXT_TEMPLATE.substitute(
+            name=top_mattress.get('name', 'Unknown'),
+            brand=top_mattress.get('brand', 'Unknown'),
+            price=top_mattress.get('price', 0),
+            type=top_mattress.get('type', 'Unknown'),
+            features=', '.join(top_mattress.get('features', [])[:3]),
+            targets=', '.join(top_mattress.get('target_users', [])[:2]),
+            similarity=f"{top_mattress.get('similarity_score', 0):.3f}",
+            enhanced=top_mattress.get('gpt_enhanced', False)
+        )
+        
+        # 사용자 컨텍스트
+        user_context = ""
+        if user_intent:
+            context_parts = [
+                part for part in (
+                    format_field(user_intent.get(key) or {})
+                    for key, format_field in _USER_CONTEXT_FIELDS
+                )
+                if part
+            ]
+            
+            if context_parts:
+                user_context = "\n\n고객 상황:\n" + '\n'.join([f"- {part}" for part in context_parts])
+        
+        return f"{context}{user_context}"
+    
+    def _build_response_messages(self, user_query: str, context: str) -> List[Dict[str, str]]:
+        """응답 생성용 메시지 구성"""
+        # Few-shot 강화 시스템 프롬프트 (고객 표기 수정 포함)
+        system_prompt = self.few_shot_manager.get_enhanced_response_generation_prompt()
+        
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"고객 질문: \"{user_query}\"\n\n{context}"}
+        ]
+    
     def _generate_fallback_response(self, user_query: str, search_results: List[Dict]) -> str:
         """폴백 응답"""
         if not search_results:
-            return "죄송합니다. 조건에 맞는 매트리스를 찾을 수 없습니다."
+            return _NO_RESULT
         
         top = search_results[0]
         return f"{top.get('name', 'Unknown')}을 추천드립니다. {top.get('price', 0)}만원으로 고객님께 적합한 제품입니다."
@@ -566,20 +1199,17 @@ class FewShotExampleManager(EnhancedFewShotManager):
 
 def get_query_expansion_examples() -> List[Dict]:
     """쿼리 확장 예시 반환 (기존 호환성)"""
-    manager = EnhancedFewShotManager()
-    return manager.query_expansion_examples
+    return get_shared_few_shot_manager().query_expansion_examples
 
 
 def get_intent_analysis_examples() -> List[Dict]:
     """의도 분석 예시 반환 (기존 호환성)"""
-    manager = EnhancedFewShotManager()
-    return manager.intent_analysis_examples
+    return get_shared_few_shot_manager().intent_analysis_examples
 
 
 def get_response_generation_examples() -> List[Dict]:
     """응답 생성 예시 반환 (기존 호환성)"""
-    manager = EnhancedFewShotManager()
-    return manager.response_generation_examples
+    return get_shared_few_shot_manager().response_generation_examples
 
 
 # 테스트 실행
@@ -10,15 +10,25 @@ RAG 시스템 - GPT 동적 동의어 + Few-shot 강화 버전
 
 import os
 import json
+import shutil
+import tempfile
+import asyncio
+import hashlib
 import logging
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 import chromadb
+import chromadb.errors
 from chromadb.config import Settings
 import numpy as np
 from datetime import datetime
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 # 한국어 특화 임베딩
 try:
@@ -28,6 +38,21 @@ try:
 except ImportError:
     HUGGINGFACE_AVAILABLE = False
 
+# ONNX Runtime 추론 백엔드 (선택사항, CPU 임베딩 가속)
+try:
+    import onnxruntime  # noqa: F401
+    import optimum.onnxruntime  # noqa: F401
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# 고속 벡터 검색 (선택사항)
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
 # OpenAI 클라이언트
 try:
     from openai import OpenAI
@@ -39,18 +64,170 @@ except ImportError:
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 from src.data_loader import MattressDataLoader
+from src.few_shot_examples import SemanticCache, _get_openai_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 정규식 사전 컴파일 (텍스트 정규화)
+_RE_NON_TEXT = re.compile(r'[^\w\s가-힣a-zA-Z0-9.,!?%-]')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_MANWON = re.compile(r'(\d+)\s*만\s*원')
+
+# 문서별 GPT 동의어를 생성할 상위 키워드 수
+SYNONYM_KEYWORDS_PER_TEXT = 5
+
+# 동의어 일괄 생성 시 동시에 진행할 최대 GPT 요청 수
+SYNONYM_CONCURRENCY = 20
+
+# 동의어 일괄 생성 시 GPT 요청 하나에 묶어 보낼 키워드 수
+SYNONYM_KEYWORDS_PER_REQUEST = 20
+
+# 동의어 생성 / Few-shot 확장에 사용하는 GPT 모델
+GPT_MODEL = "gpt-3.5-turbo"
+
+# GPT 동의어 / 임베딩 디스크 캐시 파일 (persist_directory 아래)
+CACHE_FILENAME = "rag_cache.sqlite3"
+
+# ONNX로 변환한 임베딩 모델 저장 디렉터리 (persist_directory 아래, 첫 실행에서 한 번 변환)
+ONNX_MODEL_DIRNAME = "onnx_models"
+
+# 벡터 거리 공간 (정규화 임베딩의 코사인 거리 = 1 - 코사인 유사도)
+DISTANCE_SPACE = "cosine"
+
+# 메모리 임베딩 캐시 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 제거, 디스크 캐시는 유지)
+EMBEDDING_CACHE_SIZE = 10000
+
+# ChromaDB collection.add 한 번에 넣는 문서 수 (권장 범위 50~250)
+CHROMA_ADD_BATCH_SIZE = 200
+
+# 초기화 시 임베딩 생성과 ChromaDB 저장을 겹쳐 진행하는 문서 묶음 크기
+INDEXING_CHUNK_SIZE = 1000
+
+# 검색 결과 시맨틱 캐시 (추출 키워드가 같고 원본 쿼리 임베딩 코사인 유사도가 임계값 이상이면 이전 결과 재사용)
+SEARCH_CACHE_THRESHOLD = 0.95
+SEARCH_CACHE_SIZE = 256
+
+# 다중 전략 검색 (전략 이름, 점수 가중치, n_results 대비 검색 개수 배수, 강화 보너스)
+# - 순서대로 결과 병합
+_SEARCH_STRATEGIES = (
+    ('enhanced', 1.0, 2, 0.15),   # GPT Few-shot + 동의어 강화 (최고 가중치, GPT 강화 보너스)
+    ('few_shot', 0.8, 2, 0.1),    # Few-shot만 적용 (Few-shot 보너스)
+    ('original', 0.6, 1, 0.0),    # 원본 쿼리
+)
+
+# 삭제할 컬렉션이 없을 때의 예외 (chromadb 버전별: 0.4.x ValueError, 0.5.x InvalidCollectionException, 0.6+ NotFoundError)
+_COLLECTION_MISSING_ERRORS = (ValueError,) + tuple(
+    getattr(chromadb.errors, name)
+    for name in ('NotFoundError', 'InvalidCollectionException')
+    if hasattr(chromadb.errors, name)
+)
+
+# SQLite IN (...) 조회 한 번에 넣는 최대 키 수 (바인딩 변수 제한 999 이하)
+_CACHE_LOOKUP_CHUNK = 500
+
+
+def _content_key(*parts: str) -> str:
+    """캐시 키 (입력 내용의 blake2b 해시)"""
+    return hashlib.blake2b('|'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _canonical_query(query: str) -> str:
+    """검색 쿼리 표준형 (NFKC 정규화 + 공백 정리) - 표기만 다른 같은 쿼리가 같은 캐시 키를 쓰도록"""
+    return _RE_WHITESPACE.sub(' ', unicodedata.normalize('NFKC', query)).strip()
+
+
+class SQLiteCache:
+    """
+    내용 주소 기반 키-값 디스크 캐시 (SQLite, WAL 모드)
+    
+    GPT 동의어와 임베딩을 프로세스 재시작 후에도 재사용하기 위한 저장소입니다.
+    값은 바이트로 저장하며, 직렬화는 호출하는 쪽에서 담당합니다.
+    스레드마다 별도 연결을 사용하므로 여러 작업 스레드의 조회가 서로 기다리지 않고
+    (WAL 모드는 읽기 중에도 쓰기 가능), sqlite3는 쿼리 실행 중 GIL을 놓습니다.
+    """
+    
+    def __init__(self, path: str, table: str):
+        self.path = Path(path)
+        self.table = table
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")  # 데이터베이스 파일에 유지되는 설정
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+        )
+        conn.commit()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 (처음 사용 시 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """단일 키 조회 (없으면 None)"""
+        row = self._connection().execute(
+            f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """여러 키를 한 번에 조회 (있는 키만 반환)"""
+        conn = self._connection()
+        found = {}
+        for i in range(0, len(keys), _CACHE_LOOKUP_CHUNK):
+            chunk = keys[i:i + _CACHE_LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(conn.execute(
+                f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", chunk
+            ))
+        return found
+    
+    def set(self, key: str, value: bytes):
+        """단일 키 저장"""
+        self.set_many([(key, value)])
+    
+    def set_many(self, items: Iterable[Tuple[str, bytes]]):
+        """여러 키를 한 트랜잭션으로 저장"""
+        conn = self._connection()
+        with conn:
+            conn.executemany(f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)", items)
+
+
+def _open_cache(path: Path, table: str) -> Optional[SQLiteCache]:
+    """디스크 캐시 열기 (실패 시 None → 메모리 캐시만 사용)"""
+    try:
+        return SQLiteCache(path, table)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"디스크 캐시 사용 불가 ({table}): {e}")
+        return None
+
 
 class GPTSynonymGenerator:
     """GPT 기반 동적 동의어 생성기"""
     
-    def __init__(self, openai_client=None):
+    def __init__(self, openai_client=None, disk_cache: Optional[SQLiteCache] = None):
         self.client = openai_client
         self.synonym_cache = {}
+        self.disk_cache = disk_cache
         self.few_shot_examples = self._get_few_shot_examples()
+        # 모든 요청이 같은 system 메시지로 시작하도록 한 번만 구성 (OpenAI 프롬프트 프리픽스 캐시 대상)
+        self.system_prompt = f"""
+당신은 매트리스 도메인 전문가입니다. 주어진 키워드의 동의어와 유사어를 생성하세요.
+
+{self.few_shot_examples}
+
+규칙:
+1. 매트리스 쇼핑 맥락에서 실제 사용되는 표현
+2. 정확한 동의어 8-10개 생성
+3. 한국어와 영어 모두 포함
+4. JSON 배열 형태로만 응답
+5. 키워드 목록이 주어지면 {{"키워드": [동의어, ...]}} 형태의 JSON 객체 하나로만 응답
+"""
     
     def _get_few_shot_examples(self) -> str:
         """Few-shot 학습용 동의어 생성 예시"""
@@ -84,23 +261,73 @@ class GPTSynonymGenerator:
         if keyword in self.synonym_cache:
             return self.synonym_cache[keyword]
         
+        if self.disk_cache:
+            cached = self.disk_cache.get(_content_key(GPT_MODEL, keyword))
+            if cached is not None:
+                synonyms = self.synonym_cache[keyword] = json.loads(cached)
+                return synonyms
+        
+        return self._request_synonyms(keyword)
+    
+    async def generate_synonyms_async(self, keywords: List[str]) -> Dict[str, List[str]]:
+        """
+        여러 키워드의 동의어를 동시에 생성하여 캐시에 저장
+        
+        키워드를 SYNONYM_KEYWORDS_PER_REQUEST개씩 묶어 요청 하나로 보내고(few-shot 예시를
+        키워드마다 반복 전송하지 않음), 묶음 요청은 최대 SYNONYM_CONCURRENCY개의 작업 스레드에서
+        동시에 보내 네트워크 왕복 시간을 겹칩니다. (동기 클라이언트의 커넥션 풀을 그대로 공유)
+        """
+        if not self.client or not keywords:
+            return {}
+        
+        groups = [keywords[i:i + SYNONYM_KEYWORDS_PER_REQUEST]
+                  for i in range(0, len(keywords), SYNONYM_KEYWORDS_PER_REQUEST)]
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=min(SYNONYM_CONCURRENCY, len(groups))) as executor:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, self._request_synonyms_batch, group) for group in groups
+            ))
+        
+        merged = {}
+        for result in results:
+            merged.update(result)
+        return merged
+    
+    def prefetch_synonyms(self, keywords: List[str]):
+        """캐시에 없는 키워드의 동의어를 한 번에 동시 생성 (이후 generate_synonyms는 캐시 조회)"""
+        if not self.client:
+            return
+        
+        missing = [kw for kw in dict.fromkeys(keywords) if kw not in self.synonym_cache]
+        
+        # 이전 실행에서 디스크에 저장된 동의어 일괄 조회
+        if missing and self.disk_cache:
+            keys = {kw: _content_key(GPT_MODEL, kw) for kw in missing}
+            stored = self.disk_cache.get_many(list(keys.values()))
+            for kw, key in keys.items():
+                if key in stored:
+                    self.synonym_cache[kw] = json.loads(stored[key])
+            missing = [kw for kw in missing if kw not in self.synonym_cache]
+        
+        if not missing:
+            return
+        
+        try:
+            asyncio.get_running_loop()
+            return  # 이벤트 루프 안에서는 asyncio.run 불가 → 개별 생성으로 진행
+        except RuntimeError:
+            pass
+        
+        asyncio.run(self.generate_synonyms_async(missing))
+        logger.info(f"GPT 동의어 일괄 생성: {len(missing)}개 키워드")
+    
+    def _request_synonyms(self, keyword: str) -> List[str]:
+        """GPT 동의어 요청 (성공 시 캐시에 저장, 실패 시 빈 리스트)"""
         try:
-            system_prompt = f"""
-당신은 매트리스 도메인 전문가입니다. 주어진 키워드의 동의어와 유사어를 생성하세요.
-
-{self.few_shot_examples}
-
-규칙:
-1. 매트리스 쇼핑 맥락에서 실제 사용되는 표현
-2. 정확한 동의어 8-10개 생성
-3. 한국어와 영어 모두 포함
-4. JSON 배열 형태로만 응답
-"""
-            
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=GPT_MODEL,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": f"키워드: '{keyword}'"}
                 ],
                 max_tokens=200,
@@ -112,6 +339,11 @@ class GPTSynonymGenerator:
             
             if isinstance(synonyms, list):
                 self.synonym_cache[keyword] = synonyms
+                if self.disk_cache:
+                    self.disk_cache.set(
+                        _content_key(GPT_MODEL, keyword),
+                        json.dumps(synonyms, ensure_ascii=False).encode('utf-8')
+                    )
                 logger.debug(f"GPT 동의어 생성: {keyword} → {len(synonyms)}개")
                 return synonyms
                 
@@ -119,6 +351,42 @@ class GPTSynonymGenerator:
             logger.error(f"GPT 동의어 생성 실패: {keyword}, {e}")
         
         return []
+    
+    def _request_synonyms_batch(self, keywords: List[str]) -> Dict[str, List[str]]:
+        """
+        여러 키워드의 동의어를 GPT 요청 한 번으로 생성 (성공한 키워드만 캐시에 저장)
+        
+        응답에서 빠졌거나 형식이 잘못된 키워드는 캐시에 남지 않으므로
+        이후 generate_synonyms에서 개별 요청으로 다시 생성됩니다.
+        """
+        try:
+            response = self.client.chat.completions.create(
+                model=GPT_MODEL,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": f"키워드들: {json.dumps(keywords, ensure_ascii=False)}"}
+                ],
+                max_tokens=min(200 * len(keywords), 4000),
+                temperature=0.3
+            )
+            
+            content = response.choices[0].message.content.strip()
+            parsed = json.loads(content)
+        except Exception as e:
+            logger.error(f"GPT 동의어 일괄 생성 실패: {len(keywords)}개 키워드, {e}")
+            return {}
+        
+        if not isinstance(parsed, dict):
+            return {}
+        
+        results = {kw: parsed[kw] for kw in keywords if isinstance(parsed.get(kw), list)}
+        self.synonym_cache.update(results)
+        if self.disk_cache and results:
+            self.disk_cache.set_many([
+                (_content_key(GPT_MODEL, kw), json.dumps(synonyms, ensure_ascii=False).encode('utf-8'))
+                for kw, synonyms in results.items()
+            ])
+        return results
 
 
 class EnhancedKoreanTextPreprocessor:
@@ -154,24 +422,33 @@ class EnhancedKoreanTextPreprocessor:
         """가중치 기반 키워드 추출"""
         words = self.normalize_text(text).split()
         
-        weighted_keywords = []
-        for word in words:
-            if len(word) > 1 and word not in self.stopwords:
-                weight = self.keyword_weights.get(word, 1.0)
-                weighted_keywords.append((word, weight))
+        # 루프 불변 속성 조회를 지역 변수로 끌어올림
+        stopwords = self.stopwords
+        get_weight = self.keyword_weights.get
+        
+        weighted_keywords = [
+            (word, get_weight(word, 1.0))
+            for word in words
+            if len(word) > 1 and word not in stopwords
+        ]
         
         # 가중치 기준 정렬
         return sorted(weighted_keywords, key=lambda x: x[1], reverse=True)
     
+    def synonym_keywords(self, text: str) -> List[str]:
+        """create_gpt_enhanced_text가 GPT 동의어를 조회할 상위 키워드"""
+        weighted_keywords = self.extract_weighted_keywords(self.normalize_text(text))
+        return [keyword for keyword, _ in weighted_keywords[:SYNONYM_KEYWORDS_PER_TEXT]]
+    
     def normalize_text(self, text: str) -> str:
         """한국어 텍스트 정규화"""
         if not text:
             return ""
         
         text = text.strip()
-        text = re.sub(r'[^\w\s가-힣a-zA-Z0-9.,!?%-]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'(\d+)\s*만\s*원', r'\1만원', text)
+        text = _RE_NON_TEXT.sub(' ', text)
+        text = _RE_WHITESPACE.sub(' ', text)
+        text = _RE_MANWON.sub(r'\1만원', text)
         
         return text.strip()
     
@@ -185,16 +462,15 @@ class EnhancedKoreanTextPreprocessor:
         
         # GPT 동의어 생성 (상위 키워드만)
         if self.gpt_synonym_generator:
-            for keyword, weight in weighted_keywords[:5]:  # 상위 5개만
+            for keyword, weight in weighted_keywords[:SYNONYM_KEYWORDS_PER_TEXT]:  # 상위 키워드만
                 synonyms = self.gpt_synonym_generator.generate_synonyms(keyword)
                 
                 if synonyms:
                     # 가중치에 따라 반복 횟수 결정
                     repeat_count = min(int(weight), 3)
-                    selected_synonyms = synonyms[:6]  # 상위 6개 동의어
+                    synonym_block = ' '.join(synonyms[:6])  # 상위 6개 동의어를 한 번만 결합
                     
-                    for _ in range(repeat_count):
-                        enhanced_parts.extend(selected_synonyms)
+                    enhanced_parts.append(' '.join([synonym_block] * repeat_count))
         
         # 중요 키워드 강조
         priority_keywords = [kw for kw, weight in weighted_keywords if weight >= 3.0]
@@ -203,10 +479,34 @@ class EnhancedKoreanTextPreprocessor:
         return ' '.join(enhanced_parts)
 
 
+def _save_model_atomically(model, target_dir: Path):
+    """
+    모델을 같은 위치의 임시 디렉터리에 저장한 뒤 이름 변경으로 한 번에 배치
+    
+    저장 도중 중단돼도 target_dir에는 불완전한 모델이 남지 않습니다.
+    저장에 실패해도 이미 로드한 모델은 그대로 사용하도록 경고만 남깁니다.
+    """
+    tmp_dir = None
+    try:
+        target_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{target_dir.name}.", dir=target_dir.parent))
+        model.save_pretrained(str(tmp_dir))
+        tmp_dir.rename(target_dir)
+        tmp_dir = None
+    except Exception as e:
+        # 다른 프로세스가 먼저 배치한 경우(이름 변경 실패)는 정상으로 간주
+        if not target_dir.exists():
+            logger.warning(f"ONNX 모델 저장 실패 (다음 실행에서 다시 변환): {target_dir}, {e}")
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
 class FewShotEnhancedEmbeddingManager:
     """Few-shot 학습 강화 임베딩 매니저"""
     
-    def __init__(self, model_name: str = None, gpt_synonym_generator=None):
+    def __init__(self, model_name: str = None, gpt_synonym_generator=None,
+                 disk_cache: Optional[SQLiteCache] = None, onnx_model_dir: Optional[Path] = None):
         if not HUGGINGFACE_AVAILABLE:
             raise ImportError("sentence-transformers가 설치되지 않았습니다")
         
@@ -226,13 +526,15 @@ class FewShotEnhancedEmbeddingManager:
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
         self.model = None
         self.model_name = None
+        self.backend = 'torch'
+        self.onnx_model_dir = onnx_model_dir
         
         for model in korean_models:
             try:
                 logger.info(f"모델 로드 시도: {model}")
-                self.model = SentenceTransformer(model, device=self.device)
+                self.model = self._load_model(model)
                 self.model_name = model
-                logger.info(f"✅ 모델 로드 성공: {model}")
+                logger.info(f"✅ 모델 로드 성공: {model} ({self.backend})")
                 break
             except Exception as e:
                 logger.warning(f"모델 {model} 로드 실패: {e}")
@@ -241,14 +543,57 @@ class FewShotEnhancedEmbeddingManager:
         if not self.model:
             raise RuntimeError("사용 가능한 임베딩 모델이 없습니다")
         
+        # CUDA에서는 반정밀도(FP16)로 순전파 (처리량 약 2배, VRAM 절반)
+        # CPU는 FP16 연산 지원이 고르지 않으므로 FP32 유지, 임베딩은 항상 float32로 변환하여 사용
+        if self.device == 'cuda':
+            self.model.half()
+            logger.info("임베딩 모델 FP16 전환 (CUDA)")
+        
         # 전처리기 및 캐시 초기화
         self.preprocessor = EnhancedKoreanTextPreprocessor(gpt_synonym_generator)
-        self.embedding_cache = {}
+        self.embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.expansion_cache = {}
+        self.disk_cache = disk_cache
         self.few_shot_examples = self._get_few_shot_examples()
+        self.expansion_prompt = f"""
+매트리스 검색 전문가로서 쿼리를 확장하여 검색 성능을 향상시키세요.
+
+{self.few_shot_examples}
+
+규칙:
+1. 원본 쿼리 + 동의어 + 관련 용어
+2. 매트리스 도메인 특화 용어 사용
+3. 검색 의도 정확히 파악
+4. 확장된 텍스트만 반환
+"""
         
         logger.info(f"Few-shot 강화 임베딩 매니저 초기화 완료")
         logger.info(f"모델: {self.model_name}, 디바이스: {self.device}")
     
+    def _load_model(self, model: str):
+        """
+        임베딩 모델 로드 (CPU에서는 ONNX Runtime 백엔드 우선, 실패 시 PyTorch)
+        
+        onnx_model_dir가 있으면 ONNX 변환은 첫 실행에서만 하고 그 아래에 저장해 이후에는 바로 로드합니다.
+        backend 인자가 없는 sentence-transformers(3.2 미만)도 PyTorch로 폴백합니다.
+        """
+        if self.device == 'cpu' and ONNX_AVAILABLE:
+            export_dir = Path(self.onnx_model_dir) / model.replace('/', '__') if self.onnx_model_dir else None
+            try:
+                if export_dir is not None and export_dir.exists():
+                    loaded = SentenceTransformer(str(export_dir), device=self.device, backend='onnx')
+                else:
+                    loaded = SentenceTransformer(model, device=self.device, backend='onnx')
+                    if export_dir is not None:
+                        _save_model_atomically(loaded, export_dir)
+                self.backend = 'onnx'
+                return loaded
+            except Exception as e:
+                logger.warning(f"ONNX 백엔드 로드 실패, PyTorch 사용: {model}, {e}")
+        
+        self.backend = 'torch'
+        return SentenceTransformer(model, device=self.device)
+    
     def _get_few_shot_examples(self) -> str:
         """Few-shot 학습용 쿼리 확장 예시"""
         return """
@@ -268,34 +613,30 @@ class FewShotEnhancedEmbeddingManager:
 """
     
     def generate_few_shot_expansion(self, query: str) -> str:
-        """Few-shot 학습 기반 쿼리 확장"""
+        """
+        Few-shot 학습 기반 쿼리 확장
+        
+        성공한 확장 결과는 캐시하여, 검색 한 번에서 강화 임베딩과 Few-shot 전략이
+        같은 확장을 쓰고 반복된 쿼리는 GPT 요청 없이 처리합니다.
+        """
         if not self.preprocessor.gpt_synonym_generator or not self.preprocessor.gpt_synonym_generator.client:
             return query
         
+        if query in self.expansion_cache:
+            return self.expansion_cache[query]
+        
         try:
-            system_prompt = f"""
-매트리스 검색 전문가로서 쿼리를 확장하여 검색 성능을 향상시키세요.
-
-{self.few_shot_examples}
-
-규칙:
-1. 원본 쿼리 + 동의어 + 관련 용어
-2. 매트리스 도메인 특화 용어 사용
-3. 검색 의도 정확히 파악
-4. 확장된 텍스트만 반환
-"""
-            
             response = self.preprocessor.gpt_synonym_generator.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=GPT_MODEL,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": self.expansion_prompt},
                     {"role": "user", "content": f"확장할 쿼리: '{query}'"}
                 ],
                 max_tokens=150,
                 temperature=0.4
             )
             
-            expanded = response.choices[0].message.content.strip()
+            expanded = self.expansion_cache[query] = response.choices[0].message.content.strip()
             logger.debug(f"Few-shot 확장: {query} → {expanded[:50]}...")
             return expanded
             
@@ -303,104 +644,329 @@ class FewShotEnhancedEmbeddingManager:
             logger.error(f"Few-shot 확장 실패: {e}")
             return query
     
+    def _disk_cache_key(self, text: str, use_enhancement: bool) -> str:
+        """임베딩 디스크 캐시 키 (모델/백엔드, 원본 텍스트, 강화 방식별)"""
+        if not use_enhancement:
+            mode = 'plain'
+        elif self.preprocessor.gpt_synonym_generator and self.preprocessor.gpt_synonym_generator.client:
+            mode = 'gpt'
+        else:
+            mode = 'local'  # GPT 없이 키워드 강조만 적용
+        model_id = self.model_name if self.backend == 'torch' else f"{self.model_name}#{self.backend}"
+        return _content_key(model_id, text, mode)
+    
     def generate_embedding(self, text: str, use_enhancement: bool = True) -> List[float]:
         """향상된 임베딩 생성"""
-        cache_key = f"{text}_{use_enhancement}"
-        if cache_key in self.embedding_cache:
-            return self.embedding_cache[cache_key]
+        return self.generate_embeddings_multi([(text, use_enhancement)])[0]
+    
+    def generate_embeddings_multi(self, requests: List[Tuple[str, bool]]) -> List[List[float]]:
+        """
+        여러 (텍스트, 강화 여부) 임베딩을 한 번의 encode 호출로 생성
         
-        try:
-            if not text or not text.strip():
-                text = "빈 텍스트"
+        검색 전략별 쿼리 변형처럼 적은 수의 텍스트를 모델 순전파 한 번으로 처리합니다.
+        캐시에 있는 항목은 그대로 사용하고 나머지만 인코딩합니다.
+        """
+        return [embedding.tolist() for embedding in self.generate_embeddings_multi_np(requests)]
+    
+    def generate_embeddings_multi_np(self, requests: List[Tuple[str, bool]]) -> List[np.ndarray]:
+        """
+        generate_embeddings_multi와 같지만 float32 배열을 그대로 반환
+        
+        벡터 인덱스 검색처럼 배열을 바로 쓰는 경로에서 파이썬 float 리스트 변환을 생략합니다.
+        반환된 배열은 메모리 캐시와 공유되므로 수정하지 마세요.
+        """
+        embeddings: List[Optional[np.ndarray]] = [None] * len(requests)
+        pending = []
+        
+        for i, (text, use_enhancement) in enumerate(requests):
+            cache_key = f"{text}_{use_enhancement}"
+            if cache_key in self.embedding_cache:
+                self.embedding_cache.move_to_end(cache_key)
+                embeddings[i] = self.embedding_cache[cache_key]
+                continue
             
-            if use_enhancement:
-                # 1. Few-shot 확장
-                expanded_text = self.generate_few_shot_expansion(text)
-                
-                # 2. GPT 동의어 강화
-                enhanced_text = self.preprocessor.create_gpt_enhanced_text(expanded_text)
-            else:
-                enhanced_text = self.preprocessor.normalize_text(text)
+            disk_key = None
+            if self.disk_cache:
+                disk_key = self._disk_cache_key(text, use_enhancement)
+                stored = self.disk_cache.get(disk_key)
+                if stored is not None:
+                    embeddings[i] = np.frombuffer(stored, dtype=np.float32)
+                    self._cache_embedding(cache_key, embeddings[i])
+                    continue
+            
+            pending.append((i, cache_key, disk_key, text, use_enhancement))
+        
+        if not pending:
+            return embeddings
+        
+        try:
+            enhanced_texts = [
+                self._prepare_text(text, use_enhancement) for _, _, _, text, use_enhancement in pending
+            ]
             
             # 임베딩 생성
-            embedding = self.model.encode(
-                enhanced_text,
+            vectors = self.model.encode(
+                enhanced_texts,
                 convert_to_tensor=False,
                 normalize_embeddings=True,  # 정규화로 유사도 최적화
+                batch_size=len(enhanced_texts),
                 show_progress_bar=False
             )
+            vectors = np.asarray(vectors, dtype=np.float32).reshape(len(enhanced_texts), -1)
             
-            if isinstance(embedding, np.ndarray):
-                embedding = embedding.tolist()
-            
-            self.embedding_cache[cache_key] = embedding
-            return embedding
+            for (i, cache_key, disk_key, _, _), vector in zip(pending, vectors):
+                embeddings[i] = vector
+                self._cache_embedding(cache_key, vector)
+                if disk_key:
+                    self.disk_cache.set(disk_key, vector.tobytes())
             
         except Exception as e:
             logger.error(f"임베딩 생성 실패: {e}")
             default_dim = 768 if 'roberta' in self.model_name.lower() else 384
-            return [0.0] * default_dim
+            for i, _, _, _, _ in pending:
+                embeddings[i] = np.zeros(default_dim, dtype=np.float32)
+        
+        return embeddings
+    
+    def _cache_embedding(self, cache_key: str, embedding: np.ndarray):
+        """메모리 임베딩 캐시에 저장 (EMBEDDING_CACHE_SIZE 초과 시 LRU 제거)"""
+        self.embedding_cache[cache_key] = embedding
+        self.embedding_cache.move_to_end(cache_key)
+        while len(self.embedding_cache) > EMBEDDING_CACHE_SIZE:
+            self.embedding_cache.popitem(last=False)
+    
+    def _prepare_text(self, text: str, use_enhancement: bool) -> str:
+        """임베딩할 텍스트 준비 (강화 시 Few-shot 확장 + GPT 동의어, 아니면 정규화만)"""
+        if not text or not text.strip():
+            text = "빈 텍스트"
+        
+        if use_enhancement:
+            # 1. Few-shot 확장
+            expanded_text = self.generate_few_shot_expansion(text)
+            
+            # 2. GPT 동의어 강화
+            return self.preprocessor.create_gpt_enhanced_text(expanded_text)
+        
+        return self.preprocessor.normalize_text(text)
     
     def generate_embeddings_batch(self, texts: List[str], batch_size: int = 16, 
-                                 use_enhancement: bool = True) -> List[List[float]]:
-        """배치 임베딩 생성"""
+                                 use_enhancement: bool = True) -> np.ndarray:
+        """
+        배치 임베딩 생성 ((len(texts), D) float32 배열)
+        
+        디스크 캐시에 있는 텍스트는 GPT 강화와 인코딩을 모두 건너뛰고,
+        나머지만 처리한 뒤 결과를 디스크 캐시에 한 번에 저장합니다.
+        같은 텍스트가 여러 번 나오면 처음 한 번만 처리하고 결과를 복사합니다.
+        처리할 텍스트는 길이순으로 배치를 묶어 배치 내 패딩 토큰을 줄이고,
+        결과는 원래 위치에 기록합니다.
+        다음 배치의 텍스트 강화(GPT 요청, 전처리)는 작업 스레드에서 진행하여
+        현재 배치의 모델 인코딩과 겹칩니다.
+        """
         if not texts:
-            return []
+            return np.empty((0, 0), dtype=np.float32)
         
-        embeddings = []
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
         
-        # 텍스트 전처리
-        processed_texts = []
-        for text in texts:
-            if use_enhancement:
-                expanded = self.generate_few_shot_expansion(text)
-                enhanced = self.preprocessor.create_gpt_enhanced_text(expanded)
-            else:
-                enhanced = self.preprocessor.normalize_text(text)
-            processed_texts.append(enhanced)
+        # 디스크 캐시 일괄 조회
+        disk_keys = None
+        if self.disk_cache:
+            disk_keys = [self._disk_cache_key(text, use_enhancement) for text in texts]
+            stored = self.disk_cache.get_many(list(dict.fromkeys(disk_keys)))
+            for i, key in enumerate(disk_keys):
+                value = stored.get(key)
+                if value is not None:
+                    embeddings[i] = np.frombuffer(value, dtype=np.float32)
+        
+        # 중복 텍스트는 첫 위치만 처리 대상으로 남김
+        first_positions = {}
+        duplicates = []
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                first = first_positions.setdefault(texts[i], i)
+                if first != i:
+                    duplicates.append((i, first))
+        # 길이가 비슷한 텍스트끼리 배치로 묶음 (강화 후 길이는 원문 길이를 따라가므로 원문 기준)
+        pending = sorted(first_positions.values(), key=lambda i: len(texts[i]))
+        cached_count = len(texts) - len(pending) - len(duplicates)
+        if cached_count:
+            logger.info(f"임베딩 디스크 캐시 사용: {cached_count}/{len(texts)}")
+        if duplicates:
+            logger.info(f"중복 텍스트 임베딩 재사용: {len(duplicates)}개")
+        pending_batches = [
+            [texts[i] for i in pending[start:start + batch_size]]
+            for start in range(0, len(pending), batch_size)
+        ]
+        new_entries = []
         
-        # 배치 처리
-        for i in range(0, len(processed_texts), batch_size):
-            batch_texts = processed_texts[i:i + batch_size]
+        # 배치 처리 (텍스트 강화는 한 배치 앞서 작업 스레드에서 진행)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_batch = None
+            if pending_batches:
+                next_batch = executor.submit(self._prepare_batch, pending_batches[0], use_enhancement)
             
-            try:
-                batch_embeddings = self.model.encode(
-                    batch_texts,
-                    convert_to_tensor=False,
-                    normalize_embeddings=True,
-                    batch_size=min(len(batch_texts), batch_size),
-                    show_progress_bar=False
-                )
-                
-                if isinstance(batch_embeddings, np.ndarray):
-                    if len(batch_embeddings.shape) == 1:
-                        batch_embeddings = [batch_embeddings.tolist()]
-                    else:
-                        batch_embeddings = batch_embeddings.tolist()
-                
-                embeddings.extend(batch_embeddings)
-                logger.info(f"배치 임베딩 완료: {i + len(batch_texts)}/{len(texts)}")
+            for batch_index in range(len(pending_batches)):
+                batch_texts = next_batch.result()
+                if batch_index + 1 < len(pending_batches):
+                    next_batch = executor.submit(
+                        self._prepare_batch, pending_batches[batch_index + 1], use_enhancement
+                    )
                 
-            except Exception as e:
-                logger.error(f"배치 임베딩 실패: {e}")
-                # 개별 생성으로 폴백
-                for text in batch_texts:
-                    embedding = self.generate_embedding(text, use_enhancement)
-                    embeddings.append(embedding)
+                i = batch_index * batch_size
+                batch_positions = pending[i:i + batch_size]
+                self._encode_batch(
+                    batch_texts, batch_positions, batch_size, use_enhancement,
+                    embeddings, disk_keys, new_entries
+                )
+                logger.info(f"배치 임베딩 완료: {i + len(batch_texts)}/{len(pending)}")
         
-        return embeddings
+        for i, first in duplicates:
+            embeddings[i] = embeddings[first]
+        
+        if new_entries:
+            self.disk_cache.set_many(new_entries)
+        
+        return np.stack(embeddings)
+    
+    def _prepare_batch(self, texts: List[str], use_enhancement: bool) -> List[str]:
+        """배치 텍스트 전처리 (강화 시 Few-shot 확장 + GPT 동의어)"""
+        if not use_enhancement:
+            return [self.preprocessor.normalize_text(text) for text in texts]
+        
+        expanded_texts = [self.generate_few_shot_expansion(text) for text in texts]
+        
+        # 배치 문서들의 상위 키워드 동의어를 먼저 동시에 생성 (이후 강화는 캐시 조회)
+        gpt_synonym_generator = self.preprocessor.gpt_synonym_generator
+        if gpt_synonym_generator:
+            synonym_keywords = self.preprocessor.synonym_keywords
+            gpt_synonym_generator.prefetch_synonyms(
+                [keyword for expanded in expanded_texts for keyword in synonym_keywords(expanded)]
+            )
+        
+        return [self.preprocessor.create_gpt_enhanced_text(expanded) for expanded in expanded_texts]
+    
+    def _encode_batch(self, batch_texts: List[str], batch_positions: List[int], batch_size: int,
+                      use_enhancement: bool, embeddings: List, disk_keys: Optional[List[str]],
+                      new_entries: List[Tuple[str, bytes]]):
+        """전처리된 배치 인코딩 후 결과를 embeddings의 원래 위치에 기록"""
+        try:
+            batch_embeddings = self.model.encode(
+                batch_texts,
+                convert_to_tensor=False,
+                normalize_embeddings=True,
+                batch_size=min(len(batch_texts), batch_size),
+                show_progress_bar=False
+            )
+            
+            batch_array = np.asarray(batch_embeddings, dtype=np.float32).reshape(len(batch_texts), -1)
+            
+            for position, embedding in zip(batch_positions, batch_array):
+                embeddings[position] = embedding
+            if disk_keys:
+                new_entries.extend(
+                    (disk_keys[position], vector.tobytes())
+                    for position, vector in zip(batch_positions, batch_array)
+                )
+            
+        except Exception as e:
+            logger.error(f"배치 임베딩 실패: {e}")
+            # 개별 생성으로 폴백
+            for position, text in zip(batch_positions, batch_texts):
+                embeddings[position] = self.generate_embeddings_multi_np([(text, use_enhancement)])[0]
+
+
+class FlatVectorIndex:
+    """
+    메모리 내 정확 검색 벡터 인덱스 (FAISS IndexFlatIP 우선, 없으면 NumPy 행렬곱)
+    
+    컬렉션 문서 수천 건 규모에서는 HNSW 그래프 탐색과 메타데이터 직렬화 왕복보다
+    전체 벡터와 한 번에 비교하는 편이 빠르고 결과도 정확합니다.
+    벡터는 단위 길이로 정규화해 저장하고, 거리는 컬렉션 공간(cosine)과 같은
+    1 - 코사인 유사도이며, 검색 결과는 collection.query와 같은 형식으로 반환합니다.
+    """
+    
+    def __init__(self):
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._faiss_index = None
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        """행별 단위 벡터 (영벡터는 그대로)"""
+        vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+    
+    def add(self, ids: List[str], embeddings, documents: List[str], metadatas: List[Dict]):
+        """문서 추가"""
+        vectors = self._normalize(embeddings)
+        if vectors.ndim != 2 or not vectors.size:
+            return
+        
+        if self._vectors is None:
+            self._vectors = vectors
+        else:
+            self._vectors = np.vstack([self._vectors, vectors])
+        
+        if FAISS_AVAILABLE:
+            if self._faiss_index is None:
+                self._faiss_index = faiss.IndexFlatIP(vectors.shape[1])
+            self._faiss_index.add(vectors)
+        
+        self.ids.extend(ids)
+        self.documents.extend(documents)
+        self.metadatas.extend(metadatas)
+    
+    def search(self, query_embeddings, n_results: int) -> Dict:
+        """질의 벡터별 거리 오름차순 상위 n_results개 검색 (여러 질의를 한 번에 계산)"""
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32).reshape(len(query_embeddings), -1))
+        k = min(n_results, len(self.ids))
+        if k <= 0:
+            return {key: [[] for _ in queries] for key in ('ids', 'distances', 'metadatas', 'documents')}
+        
+        if self._faiss_index is not None:
+            similarities, all_top = self._faiss_index.search(queries, k)
+            all_distances = np.maximum(1 - similarities, 0)
+        else:
+            # 단위 벡터이므로 코사인 거리 = 1 - x·q
+            # (질의가 몇 개뿐이므로 (q, d) x (d, n) 행렬곱보다 질의별 행렬-벡터 곱이 빠름)
+            distances = 1 - np.stack([self._vectors @ query for query in queries])
+            np.maximum(distances, 0, out=distances)
+            
+            if k < distances.shape[1]:
+                candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            else:
+                candidates = np.broadcast_to(np.arange(distances.shape[1]), distances.shape)
+            all_top = np.array([
+                row_candidates[np.lexsort((row_candidates, row_distances[row_candidates]))]
+                for row_candidates, row_distances in zip(candidates, distances)
+            ])
+            all_distances = np.take_along_axis(distances, all_top, axis=1)
+        
+        return {
+            'ids': [[self.ids[i] for i in top] for top in all_top],
+            'distances': all_distances.tolist(),
+            'metadatas': [[self.metadatas[i] for i in top] for top in all_top],
+            'documents': [[self.documents[i] for i in top] for top in all_top]
+        }
 
 
 class ChromaDBManager:
-    """ChromaDB 벡터 데이터베이스 관리"""
+    """ChromaDB 벡터 데이터베이스 관리 (영구 저장은 ChromaDB, 검색은 메모리 내 정확 인덱스)"""
     
     def __init__(self, persist_directory: str = "./chroma_db"):
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(exist_ok=True)
         
         self.client = chromadb.PersistentClient(path=str(self.persist_directory))
-        self.collection_name = "enhanced_mattress_collection_v4"
+        self.collection_name = "enhanced_mattress_collection_v5"
         self.collection = None
+        self.index = FlatVectorIndex()
         
         logger.info(f"ChromaDB 매니저 초기화: {self.persist_directory}")
     
@@ -411,13 +977,14 @@ class ChromaDBManager:
                 try:
                     self.client.delete_collection(self.collection_name)
                     logger.info("기존 컬렉션 삭제")
-                except:
-                    pass
+                except _COLLECTION_MISSING_ERRORS:
+                    pass  # 처음 실행이라 삭제할 컬렉션 없음 (그 외 오류는 아래에서 실패 처리)
             
             self.collection = self.client.get_or_create_collection(
                 name=self.collection_name,
-                metadata={"description": "GPT + Few-shot 강화 매트리스 벡터 DB"}
+                metadata={"description": "GPT + Few-shot 강화 매트리스 벡터 DB", "hnsw:space": DISTANCE_SPACE}
             )
+            self._load_index()
             
             logger.info(f"컬렉션 '{self.collection_name}' 준비 완료")
             return True
@@ -426,19 +993,40 @@ class ChromaDBManager:
             logger.error(f"컬렉션 생성 실패: {e}")
             return False
     
-    def add_documents(self, documents: List[str], embeddings: List[List[float]], 
-                     metadatas: List[Dict], ids: List[str]) -> bool:
-        """문서 추가"""
+    def _load_index(self):
+        """저장된 컬렉션 벡터로 검색 인덱스 재구성 (시작 시 한 번)"""
+        self.index = FlatVectorIndex()
+        
+        if not self.collection.count():
+            return
+        
+        stored = self.collection.get(include=["embeddings", "documents", "metadatas"])
+        self.index.add(stored['ids'], stored['embeddings'], stored['documents'], stored['metadatas'])
+        logger.info(f"검색 인덱스 로드: {len(self.index)}개 ({'FAISS' if FAISS_AVAILABLE else 'NumPy'})")
+    
+    def add_documents(self, documents: List[str], embeddings, 
+                     metadatas: List[Dict], ids: List[str],
+                     batch_size: int = CHROMA_ADD_BATCH_SIZE) -> bool:
+        """
+        문서 추가 (batch_size개씩 나누어 삽입)
+        
+        embeddings는 (N, D) float32 배열 또는 벡터 리스트입니다. 메모리 인덱스에는 배열을
+        그대로 넣고, ChromaDB에는 구버전(0.4.x)도 받는 리스트로 묶음별 변환하여 넣습니다.
+        """
         if not self.collection:
             return False
         
         try:
-            self.collection.add(
-                documents=documents,
-                embeddings=embeddings,
-                metadatas=metadatas,
-                ids=ids
-            )
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            for i in range(0, len(ids), batch_size):
+                end = i + batch_size
+                self.collection.add(
+                    documents=documents[i:end],
+                    embeddings=embeddings[i:end].tolist(),
+                    metadatas=metadatas[i:end],
+                    ids=ids[i:end]
+                )
+            self.index.add(ids, embeddings, documents, metadatas)
             
             logger.info(f"문서 {len(documents)}개 추가 완료")
             return True
@@ -449,19 +1037,31 @@ class ChromaDBManager:
     
     def search_similar(self, query_embedding: List[float], n_results: int = 5) -> Dict:
         """유사 문서 검색"""
+        return self.search_similar_batch([query_embedding], n_results)[0]
+    
+    def search_similar_batch(self, query_embeddings: List[List[float]], n_results: int = 5) -> List[Dict]:
+        """여러 질의 벡터를 한 번에 검색 (질의별로 collection.query 형식 결과)"""
         if not self.collection:
-            return {}
+            return [{} for _ in query_embeddings]
         
         try:
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results
-            )
-            return results
+            if len(self.index):
+                results = self.index.search(query_embeddings, n_results)
+            else:
+                results = self.collection.query(
+                    query_embeddings=np.asarray(query_embeddings, dtype=np.float32).tolist(),
+                    n_results=n_results,
+                    include=["documents", "metadatas", "distances"]  # 사용하는 필드만 반환
+                )
+            
+            return [
+                {key: [results[key][i]] for key in ('ids', 'distances', 'metadatas', 'documents')}
+                for i in range(len(query_embeddings))
+            ]
             
         except Exception as e:
             logger.error(f"검색 실패: {e}")
-            return {}
+            return [{} for _ in query_embeddings]
     
     def get_collection_info(self) -> Dict:
         """컬렉션 정보"""
@@ -484,23 +1084,24 @@ class EnhancedMattressRAGSystem:
     def __init__(self, persist_directory: str = "./chroma_db", 
                  model_name: str = None, openai_api_key: str = None):
         
-        # GPT 클라이언트 초기화
+        # GPT 클라이언트 (Few-shot 모듈과 API 키별 커넥션 풀 공유, 재시도 포함)
         gpt_client = None
         if openai_api_key and OPENAI_AVAILABLE:
-            try:
-                gpt_client = OpenAI(api_key=openai_api_key)
-                logger.info("✅ OpenAI 클라이언트 초기화 성공")
-            except Exception as e:
-                logger.error(f"OpenAI 클라이언트 초기화 실패: {e}")
+            gpt_client = _get_openai_client(openai_api_key, "RAG 시스템")
+        
+        # GPT 동의어 / 임베딩 디스크 캐시 (재시작 후에도 재사용)
+        cache_path = Path(persist_directory) / CACHE_FILENAME
         
         # GPT 동의어 생성기
-        self.gpt_synonym_generator = GPTSynonymGenerator(gpt_client)
+        self.gpt_synonym_generator = GPTSynonymGenerator(gpt_client, _open_cache(cache_path, 'synonyms'))
         
         # 컴포넌트 초기화
         self.embedding_manager = FewShotEnhancedEmbeddingManager(
-            model_name, self.gpt_synonym_generator
+            model_name, self.gpt_synonym_generator, _open_cache(cache_path, 'embeddings'),
+            Path(persist_directory) / ONNX_MODEL_DIRNAME
         )
         self.chroma_manager = ChromaDBManager(persist_directory)
+        self.search_cache = SemanticCache(SEARCH_CACHE_THRESHOLD, SEARCH_CACHE_SIZE)
         self.data_loader = None
         
         self.is_initialized = False
@@ -515,6 +1116,7 @@ class EnhancedMattressRAGSystem:
             logger.info("Enhanced RAG 시스템 데이터 초기화 시작")
             
             self.data_loader = data_loader
+            self.search_cache.clear()
             
             if not self.chroma_manager.create_collection(reset=reset_db):
                 return False
@@ -526,24 +1128,35 @@ class EnhancedMattressRAGSystem:
                 self.is_initialized = True
                 return True
             
-            # RAG 데이터 전처리
-            rag_data = data_loader.preprocess_for_rag()
-            if not rag_data:
-                return False
-            
-            documents = [item['search_text'] for item in rag_data]
-            metadatas = [item['metadata'] for item in rag_data]
-            ids = [item['id'] for item in rag_data]
+            logger.info(f"강화된 임베딩 생성 시작: {len(data_loader.mattresses)}개")
             
-            logger.info(f"강화된 임베딩 생성 시작: {len(documents)}개")
+            # RAG 전처리 + 강화된 임베딩 생성 + ChromaDB 저장
+            # (INDEXING_CHUNK_SIZE개씩 전처리하여 전체 레코드 리스트를 만들지 않고,
+            #  이전 묶음 저장은 작업 스레드에서 다음 묶음 전처리/임베딩과 겹쳐 진행)
+            stored = True
+            stored_count = 0
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                pending_write = None
+                for ids, documents, metadatas in data_loader.preprocess_for_rag_batched(INDEXING_CHUNK_SIZE):
+                    embeddings = self.embedding_manager.generate_embeddings_batch(
+                        documents, use_enhancement=True
+                    )
+                    
+                    if pending_write is not None and not pending_write.result():
+                        stored = False
+                        break
+                    pending_write = writer.submit(
+                        self.chroma_manager.add_documents, documents, embeddings, metadatas, ids
+                    )
+                    stored_count += len(ids)
+                
+                if stored and pending_write is not None:
+                    stored = pending_write.result()
             
-            # 강화된 임베딩 생성
-            embeddings = self.embedding_manager.generate_embeddings_batch(
-                documents, use_enhancement=True
-            )
+            if not stored_count:
+                return False
             
-            # ChromaDB 저장
-            if self.chroma_manager.add_documents(documents, embeddings, metadatas, ids):
+            if stored:
                 self.is_initialized = True
                 logger.info("✅ Enhanced RAG 시스템 초기화 완료")
                 return True
@@ -561,117 +1174,137 @@ class EnhancedMattressRAGSystem:
             return []
         
         try:
+            query = _canonical_query(query)
             logger.info(f"Enhanced 검색 시작: '{query}'")
             
-            all_results = {}
-            
-            # 전략 1: GPT Few-shot + 동의어 강화 검색 (최고 가중치)
-            enhanced_results = self._search_with_full_enhancement(query, n_results * 2)
-            self._add_weighted_results(all_results, enhanced_results, 1.0, 'enhanced')
-            
-            # 전략 2: Few-shot만 적용 검색
-            few_shot_results = self._search_with_few_shot_only(query, n_results * 2)
-            self._add_weighted_results(all_results, few_shot_results, 0.8, 'few_shot')
+            # 같은 조건의 같은/비슷한 쿼리는 이전 결과 재사용 (Few-shot 확장 GPT 요청과 검색 생략)
+            # - 유사 쿼리는 추출 키워드 집합이 같을 때만 재사용 (예: '딱딱한' / '푹신한'만 다른 쿼리는 제외)
+            # - 호출자가 결과 최상위 키를 수정해도 캐시가 바뀌지 않도록 결과별 얕은 복사본 반환
+            keywords = sorted({
+                keyword for keyword, _ in self.embedding_manager.preprocessor.extract_weighted_keywords(query)
+            })
+            context_key = f"{n_results}|{tuple(budget_filter) if budget_filter else None}|{' '.join(keywords)}"
+            cached = self.search_cache.get_exact(query, context_key)
+            query_embedding = None
+            if cached is None:
+                query_embedding = self.embedding_manager.generate_embeddings_multi_np([(query, False)])[0]
+                cached = self.search_cache.get_similar(query_embedding, context_key)
+                if cached is not None:
+                    logger.info(f"검색 캐시 유사 쿼리 재사용: '{query}' ← '{cached[0]}'")
+            if cached is not None:
+                return [dict(result) for result in cached[1]]
             
-            # 전략 3: 원본 쿼리 검색
-            original_results = self._search_with_original(query, n_results)
-            self._add_weighted_results(all_results, original_results, 0.6, 'original')
+            # 전략별 쿼리 임베딩을 한 번의 다중 질의 검색으로 처리
+            # (가장 많이 필요한 개수로 검색하고, 전략별로 필요한 개수만 사용)
+            max_results = n_results * max(strategy[2] for strategy in _SEARCH_STRATEGIES)
+            strategy_results = self.chroma_manager.search_similar_batch(
+                self._strategy_embeddings(query), max_results
+            )
             
             # 최종 결과 계산
             final_results = self._calculate_final_results(
-                all_results, budget_filter, n_results
+                strategy_results, budget_filter, n_results
             )
+            self.search_cache.put(query, query_embedding, (query, final_results), context_key)
             
             logger.info(f"Enhanced 검색 완료: {len(final_results)}개")
-            return final_results
+            return [dict(result) for result in final_results]
             
         except Exception as e:
             logger.error(f"Enhanced 검색 실패: {e}")
             return []
     
-    def _search_with_full_enhancement(self, query: str, n_results: int) -> Dict:
-        """완전 강화 검색 (Few-shot + GPT 동의어)"""
-        embedding = self.embedding_manager.generate_embedding(query, use_enhancement=True)
-        return self.chroma_manager.search_similar(embedding, n_results)
-    
-    def _search_with_few_shot_only(self, query: str, n_results: int) -> Dict:
-        """Few-shot만 적용 검색"""
+    def _strategy_embeddings(self, query: str) -> List[np.ndarray]:
+        """_SEARCH_STRATEGIES 순서의 전략별 쿼리 임베딩"""
         expanded_query = self.embedding_manager.generate_few_shot_expansion(query)
-        embedding = self.embedding_manager.generate_embedding(expanded_query, use_enhancement=False)
-        return self.chroma_manager.search_similar(embedding, n_results)
-    
-    def _search_with_original(self, query: str, n_results: int) -> Dict:
-        """원본 쿼리 검색"""
-        embedding = self.embedding_manager.generate_embedding(query, use_enhancement=False)
-        return self.chroma_manager.search_similar(embedding, n_results)
-    
-    def _add_weighted_results(self, all_results: Dict, search_results: Dict, 
-                            weight: float, strategy: str):
-        """가중치 적용 결과 추가"""
-        if not search_results.get('documents'):
-            return
         
-        for i in range(len(search_results['documents'][0])):
-            doc_id = search_results['ids'][0][i]
-            distance = search_results['distances'][0][i]
-            weighted_score = (1 - distance) * weight
-            
-            if doc_id not in all_results:
-                all_results[doc_id] = {
-                    'metadata': search_results['metadatas'][0][i],
-                    'document': search_results['documents'][0][i],
-                    'scores': {},
-                    'total_score': 0,
-                    'strategy_count': 0
-                }
-            
-            all_results[doc_id]['scores'][strategy] = weighted_score
-            all_results[doc_id]['total_score'] += weighted_score
-            all_results[doc_id]['strategy_count'] += 1
-    
-    def _calculate_final_results(self, all_results: Dict, 
+        # 세 변형을 한 번의 encode로 생성 (인덱스 검색에 배열 그대로 전달)
+        return self.embedding_manager.generate_embeddings_multi_np([
+            (query, True),             # 완전 강화 (Few-shot + GPT 동의어)
+            (expanded_query, False),   # Few-shot만 적용
+            (query, False),            # 원본 쿼리
+        ])
+    
+    def _calculate_final_results(self, strategy_results: List[Dict], 
                                budget_filter: Optional[Tuple[int, int]], 
                                n_results: int) -> List[Dict]:
-        """최종 결과 계산"""
-        final_results = []
+        """
+        전략별 검색 결과 병합 및 최종 점수 계산
         
-        for doc_id, data in all_results.items():
-            metadata = data['metadata']
-            price = metadata.get('price', 0)
-            
-            # 예산 필터
-            if budget_filter:
-                min_budget, max_budget = budget_filter
-                if price < min_budget or price > max_budget:
-                    continue
-            
-            # 최종 점수 계산
-            avg_score = data['total_score'] / data['strategy_count']
-            
-            # 강화 전략 보너스
-            enhancement_bonus = 0
-            if 'enhanced' in data['scores']:
-                enhancement_bonus += 0.15  # GPT 강화 보너스
-            if 'few_shot' in data['scores']:
-                enhancement_bonus += 0.1   # Few-shot 보너스
-            
-            # 다중 전략 보너스
-            multi_bonus = min(data['strategy_count'] * 0.05, 0.15)
-            
-            final_score = min(avg_score + enhancement_bonus + multi_bonus, 1.0)
+        모든 전략의 검색 결과를 한 줄로 펼친 뒤 문서별 합계/개수/보너스를
+        NumPy 집계로 한 번에 계산합니다. 문서 순서는 처음 검색된 순서를 따릅니다.
+        """
+        # 전략별 결과 펼치기 (전략 순서 유지, 전략별로 필요한 개수만)
+        hit_ids, hit_metadatas, hit_documents = [], [], []
+        hit_distances, hit_weights, hit_bonuses, hit_strategies = [], [], [], []
+        
+        for strategy_index, ((_, weight, multiple, bonus), search_results) in enumerate(
+            zip(_SEARCH_STRATEGIES, strategy_results)
+        ):
+            if not search_results.get('documents'):
+                continue
             
-            # 결과 포맷팅
-            mattress_info = self._format_result(doc_id, data, final_score)
-            final_results.append(mattress_info)
+            limit = n_results * multiple
+            ids = search_results['ids'][0][:limit]
+            hit_ids.extend(ids)
+            hit_metadatas.extend(search_results['metadatas'][0][:limit])
+            hit_documents.extend(search_results['documents'][0][:limit])
+            hit_distances.extend(search_results['distances'][0][:limit])
+            hit_weights.extend([weight] * len(ids))
+            hit_bonuses.extend([bonus] * len(ids))
+            hit_strategies.extend([strategy_index] * len(ids))
+        
+        if not hit_ids:
+            return []
+        
+        # 문서별 그룹 번호 (처음 검색된 순서) 및 문서별 첫 검색 결과 위치
+        doc_index: Dict[str, int] = {}
+        doc_hits = []
+        groups = []
+        for hit, doc_id in enumerate(hit_ids):
+            group = doc_index.get(doc_id)
+            if group is None:
+                group = doc_index[doc_id] = len(doc_hits)
+                doc_hits.append(hit)
+            groups.append(group)
         
-        # 점수 기준 정렬
-        final_results.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return final_results[:n_results]
+        # 가중 점수 합계 / 전략 수 / 강화 보너스 / 사용 전략 비트마스크
+        groups = np.asarray(groups)
+        weighted_scores = (1 - np.asarray(hit_distances, dtype=np.float64)) * hit_weights
+        total_scores = np.bincount(groups, weights=weighted_scores)
+        strategy_counts = np.bincount(groups)
+        enhancement_bonus = np.bincount(groups, weights=hit_bonuses)
+        # (한 전략 결과 안에서 문서는 한 번만 나오므로 비트 합계 = 비트 OR)
+        strategy_masks = np.bincount(groups, weights=np.left_shift(1, hit_strategies)).astype(np.int64)
+        
+        # 최종 점수 = 평균 + 강화 보너스 + 다중 전략 보너스
+        multi_bonus = np.minimum(strategy_counts * 0.05, 0.15)
+        final_scores = np.minimum(total_scores / strategy_counts + enhancement_bonus + multi_bonus, 1.0)
+        
+        # 예산 필터
+        candidates = np.arange(len(doc_hits))
+        if budget_filter:
+            min_budget, max_budget = budget_filter
+            prices = np.array([hit_metadatas[hit].get('price', 0) for hit in doc_hits], dtype=np.float64)
+            candidates = np.flatnonzero((prices >= min_budget) & (prices <= max_budget))
+        
+        # 점수 기준 정렬 (동점이면 먼저 검색된 문서 우선) 후 상위 결과만 포맷팅
+        top = candidates[np.argsort(-final_scores[candidates], kind='stable')][:n_results]
+        
+        strategy_names = [strategy[0] for strategy in _SEARCH_STRATEGIES]
+        final_results = []
+        for doc, final_score, mask in zip(top.tolist(), final_scores[top].tolist(), strategy_masks[top].tolist()):
+            hit = doc_hits[doc]
+            strategies = [name for bit, name in enumerate(strategy_names) if mask >> bit & 1]
+            final_results.append(self._format_result(
+                hit_ids[hit], hit_metadatas[hit], hit_documents[hit], strategies, final_score
+            ))
+        
+        return final_results
     
-    def _format_result(self, doc_id: str, data: Dict, final_score: float) -> Dict:
+    def _format_result(self, doc_id: str, metadata: Dict, document: str,
+                       strategies: List[str], final_score: float) -> Dict:
         """결과 포맷팅"""
-        metadata = data['metadata']
-        
         # features와 target_users 복원
         features_text = metadata.get('features_text', '')
         features = [f.strip() for f in features_text.split(',') if f.strip()] if features_text else []
@@ -687,12 +1320,12 @@ class EnhancedMattressRAGSystem:
             'price': int(round(metadata.get('price', 0))),  # 정수로 반올림
             'price_won': metadata.get('price_won', metadata.get('price', 0) * 10000),
             'similarity_score': final_score,
-            'search_text': data['document'],
+            'search_text': document,
             'features': features,
             'target_users': target_users,
             'features_count': len(features),
             'target_users_count': len(target_users),
-            'strategies_used': list(data['scores'].keys()),
+            'strategies_used': strategies,
             'gpt_enhanced': self.gpt_available,
             'enhanced_system': True
         }